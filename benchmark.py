@@ -0,0 +1,193 @@
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PARTS = ('part1', 'part2', 'part3', 'part4')
+SOURCES = ('UCI', 'Kaggle', 'OpenML', 'LeCun', 'Toronto')
+AUTHORS = ('Cortes', 'Vapnik', 'LeCun', 'Breiman', 'He', 'Zhang', 'Ren', 'Sun', 'Cover', 'Hart')
+
+# Records.compute_statistics (part2/part3) and part4's result validation cannot take '--' values
+ACCEPTS_ONGOING = {'part1': True, 'part2': False, 'part3': False, 'part4': False}
+
+PHASES = {
+    'part1': ('read_datasets', 'read_algorithms', 'read_results', 'display_results'),
+    'part2': ('read_datasets', 'read_algorithms', 'read_results', 'display_results', 'compute_statistics', 'display_dataset_information'),
+    'part3': ('read_datasets', 'read_algorithms', 'read_results', 'compute_statistics', 'algorithm_compute_statistics', 'compute_all_statistics', 'display_algorithm_information'),
+    'part4': ('read_datasets', 'read_algorithms', 'read_results', 'compute_statistics', 'algorithm_compute_statistics', 'compute_scores', 'compute_all_statistics', 'display_results'),
+}
+
+
+def grid_shape(results, density):
+    # part4 only accepts dataset IDs D00S-D99A, so at most 200 datasets
+    datasets = min(200, max(3, round(math.sqrt(results / density))))
+    algorithms = max(1, math.ceil(results / (datasets * density)))
+    return algorithms, datasets
+
+
+def generate_inputs(directory, algorithms, datasets, density=0.8, fail_share=0.1, ongoing_share=0.0, seed=0):
+    rnd = random.Random(seed)
+    dataset_file_name = os.path.join(directory, 'datasets.txt')
+    algorithm_file_name = os.path.join(directory, 'algorithms.txt')
+    result_file_name = os.path.join(directory, 'results.txt')
+    dataset_ids = [f"D{j // 2:02d}{'SA'[j % 2]}" for j in range(datasets)]
+    with open(dataset_file_name, 'w') as file:
+        for j, dataset_id in enumerate(dataset_ids):
+            file.write(f"{dataset_id}, Dataset{j}, {rnd.randint(1, 5)}, {rnd.randint(100, 100000)}, {rnd.choice(SOURCES)}\n")
+    with open(algorithm_file_name, 'w') as file:
+        for i in range(algorithms):
+            authors = ', '.join(rnd.sample(AUTHORS, rnd.randint(1, 3)))
+            file.write(f"Alg{i}, {rnd.choice(('ML', 'DL'))}, {rnd.randint(1960, 2023)}, {authors}\n")
+    with open(result_file_name, 'w') as file:
+        for i in range(algorithms):
+            cells = []
+            for dataset_id in dataset_ids:
+                # Cells left out of the line are the missing (XX) results
+                if rnd.random() >= density:
+                    continue
+                x = rnd.random()
+                if x < fail_share:
+                    value = '404'
+                elif x < fail_share + ongoing_share:
+                    value = '--'
+                else:
+                    value = f"{rnd.uniform(0, 100):.1f}"
+                cells.append(f"{dataset_id}: {value}")
+            if not cells:
+                cells.append(f"{dataset_ids[0]}: {rnd.uniform(0, 100):.1f}")
+            file.write(f"Alg{i}, {', '.join(cells)}\n")
+    return result_file_name, dataset_file_name, algorithm_file_name
+
+
+def phase_call(records, phase):
+    if phase == 'algorithm_compute_statistics':
+        return lambda: [algorithm.compute_statistics(records.results, records.datasets) for algorithm in records.algorithms]
+    return getattr(records, phase)
+
+
+def run_pipeline(part, result_file_name, dataset_file_name, algorithm_file_name, trace_memory=False):
+    module = importlib.import_module(part)
+    records = module.Records()
+    arguments = {'read_datasets': dataset_file_name, 'read_algorithms': algorithm_file_name, 'read_results': result_file_name}
+    phases = {}
+    for phase in PHASES[part]:
+        call = phase_call(records, phase)
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            call(arguments[phase]) if phase in arguments else call()
+        elapsed = time.perf_counter() - start
+        phases[phase] = {'seconds': round(elapsed, 6)}
+        if trace_memory:
+            phases[phase]['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return {'results': len(records.results), 'phases': phases}
+
+
+def run_single(part, results, density, fail_share, ongoing_share, seed, trace_memory):
+    algorithms, datasets = grid_shape(results, density)
+    with tempfile.TemporaryDirectory() as directory:
+        input_files = generate_inputs(directory, algorithms, datasets, density, fail_share, ongoing_share if ACCEPTS_ONGOING[part] else 0.0, seed)
+        # part4 appends to reports.txt in the working directory
+        os.chdir(directory)
+        run = run_pipeline(part, *input_files, trace_memory=trace_memory)
+    run.update(part=part, algorithms=algorithms, datasets=datasets, requested_results=results,
+               peak_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    return run
+
+
+def time_updates(algorithms, datasets, updates, seed):
+    # Mean cost of one part4 Records.update_result on a dense grid, after the running statistics are built
+    import part4
+    rnd = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        result_file_name, dataset_file_name, algorithm_file_name = generate_inputs(directory, algorithms, datasets, density=1.0, seed=seed)
+        records = part4.Records()
+        records.load(result_file_name, dataset_file_name, algorithm_file_name)
+    records.track_statistics()
+    cells = [(rnd.choice(records.algorithms), rnd.choice(records.datasets), rnd.choice(('404', f"{rnd.uniform(0, 100):.1f}")))
+             for _ in range(updates)]
+    start = time.perf_counter()
+    for algorithm, dataset, result_value in cells:
+        records.update_result(algorithm, dataset, result_value)
+    return (time.perf_counter() - start) / updates
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each phase of the part1-part4 pipelines on synthetic inputs.")
+    parser.add_argument('--parts', nargs='+', choices=PARTS, default=list(PARTS))
+    parser.add_argument('--sizes', nargs='+', type=float, default=[1e2, 1e3, 1e4, 1e5], help="number of results per run, e.g. 1e2 ... 1e7")
+    parser.add_argument('--density', type=float, default=0.8, help="share of algorithm x dataset cells that have a result")
+    parser.add_argument('--fail-share', type=float, default=0.1, help="share of present results that are 404")
+    parser.add_argument('--ongoing-share', type=float, default=0.05, help="share of present results that are --")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--trace-memory', action='store_true', help="record the tracemalloc peak of every phase (slower)")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--single', nargs=2, metavar=('PART', 'RESULTS'), help=argparse.SUPPRESS)
+    parser.add_argument('--update-scaling', nargs='+', type=int, metavar='ALGORITHMS',
+                        help="instead of the pipelines, time part4 update_result on dense 200-dataset grids of these algorithm counts")
+    args = parser.parse_args()
+
+    if args.update_scaling:
+        for algorithms in args.update_scaling:
+            seconds = time_updates(algorithms, 200, 2000, args.seed)
+            print(f"update_result {algorithms:>7} algorithms x 200 datasets {seconds * 1e6:9.1f} us per update")
+        return
+
+    if args.single:
+        part, results = args.single
+        run = run_single(part, int(float(results)), args.density, args.fail_share, args.ongoing_share, args.seed, args.trace_memory)
+        print(json.dumps(run))
+        return
+
+    # Each run gets its own interpreter so peak RSS belongs to that run alone
+    script = os.path.abspath(__file__)
+    runs = []
+    for size in args.sizes:
+        for part in args.parts:
+            command = [sys.executable, script, '--single', part, str(int(size)), '--density', str(args.density),
+                       '--fail-share', str(args.fail_share), '--ongoing-share', str(args.ongoing_share), '--seed', str(args.seed)]
+            if args.trace_memory:
+                command.append('--trace-memory')
+            completed = subprocess.run(command, capture_output=True, text=True, cwd=os.path.dirname(script))
+            if completed.returncode != 0:
+                print(f"{part} at {int(size)} results failed:\n{completed.stderr}", file=sys.stderr)
+                continue
+            run = json.loads(completed.stdout)
+            runs.append(run)
+            total = sum(phase['seconds'] for phase in run['phases'].values())
+            print(f"{part} {run['results']:>9} results {total:9.3f}s {run['peak_rss_kb']:>9} KB")
+
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'density': args.density, 'fail_share': args.fail_share, 'ongoing_share': args.ongoing_share, 'seed': args.seed},
+        'runs': runs,
+    }
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import sys
+
+REPORTS = ('results', 'datasets', 'algorithms', 'report')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='my_record.py', description="Load the result, dataset and algorithm files once and print the requested reports.")
+    parser.add_argument('result_file_name')
+    parser.add_argument('dataset_file_name')
+    parser.add_argument('algorithm_file_name')
+    parser.add_argument('reports', nargs='*', metavar='report', help=f"any of {', '.join(REPORTS)}; 'report' appends the scored report to the report file")
+    parser.add_argument('--all', action='store_true', help="produce every report (the default when none is named)")
+    parser.add_argument('--format', default='text', choices=('text', 'csv', 'json', 'ndjson'))
+    parser.add_argument('--output', help="write the results, datasets and algorithms reports here instead of stdout")
+    parser.add_argument('--report-file', default='reports.txt')
+    parser.add_argument('--snapshot', help="snapshot file used to skip parsing unchanged inputs")
+    parser.add_argument('--validate', action='store_true', help="check every input line first and list all problems found before loading")
+    parser.add_argument('--fail-fast', action='store_true', help="with --validate, stop at the first problem")
+    parser.add_argument('--columnar', action='store_true', help="compute statistics with the columnar result matrix")
+    parser.add_argument('--compare-with', nargs=3, metavar=('OLD_RESULT', 'OLD_DATASET', 'OLD_ALGORITHM'),
+                        help="also write a delta report of what changed since these older input files")
+    parser.add_argument('--max-changes', type=int, help="list at most this many changed results in the delta report")
+    parser.add_argument('--quantiles', action='store_true', help="add estimated Median, P90 and P99 columns to the datasets and algorithms reports")
+    parser.add_argument('--database', help="keep the results in this SQLite database instead of memory; it is reused while the inputs are unchanged")
+    parser.add_argument('--workers', type=int, help="compute statistics and scores in this many processes over shared memory")
+    parser.add_argument('--sparse', action='store_true', help="store only present results and compute statistics from them; best when most cells are empty")
+    args = parser.parse_intermixed_args(argv)
+    unknown = [report for report in args.reports if report not in REPORTS]
+    if unknown:
+        parser.error(f"unknown report: {', '.join(unknown)} (choose from {', '.join(REPORTS)})")
+    reports = REPORTS if args.all or not (args.reports or args.compare_with) else args.reports
+
+    from part4 import Records, ReportWriter, SQLiteRecords, compare_records
+
+    if args.database:
+        records = SQLiteRecords(args.database, sketches=args.quantiles)
+    else:
+        records = Records(columnar=args.columnar, sparse=args.sparse, sketches=args.quantiles, workers=args.workers)
+    if args.validate:
+        validation = records.validate_inputs(args.result_file_name, args.dataset_file_name, args.algorithm_file_name, args.fail_fast)
+        if not validation.ok:
+            print(validation, file=sys.stderr)
+            sys.exit(1)
+    records.load(args.result_file_name, args.dataset_file_name, args.algorithm_file_name, args.snapshot)
+    records.compute_all_statistics()
+
+    if any(report != 'report' for report in reports) or args.compare_with:
+        with ReportWriter(args.output, args.format, mode='w') as writer:
+            if 'results' in reports:
+                records.write_results_table(writer)
+            if 'datasets' in reports:
+                records.write_dataset_information(writer)
+            if 'algorithms' in reports:
+                records.write_algorithm_information(writer)
+            if args.compare_with:
+                old_records = Records()
+                old_records.load(*args.compare_with)
+                writer.write_text("\n")
+                compare_records(old_records, records).write(writer, args.max_changes)
+    if 'report' in reports:
+        records.display_results(args.report_file, args.format)
+        print(f"Report written to {args.report_file}.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import sys
+
 class Dataset:
     def __init__(self, dataset_id, name, version, size, source):
         self.dataset_id = dataset_id
@@ -18,13 +20,27 @@ class Records:
         self.datasets = []
         self.algorithms = []
         self.results = {}
+        self.dataset_index = {}
+        self.algorithm_index = {}
 
     def add_dataset(self, dataset):
+        if dataset.dataset_id in self.dataset_index:
+            raise ValueError(f"Duplicate dataset ID: {dataset.dataset_id}")
+        self.dataset_index[dataset.dataset_id] = dataset
         self.datasets.append(dataset)
 
     def add_algorithm(self, algorithm):
+        if algorithm.name in self.algorithm_index:
+            raise ValueError(f"Duplicate algorithm name: {algorithm.name}")
+        self.algorithm_index[algorithm.name] = algorithm
         self.algorithms.append(algorithm)
 
+    def get_dataset(self, dataset_id):
+        return self.dataset_index.get(dataset_id)
+
+    def get_algorithm(self, name):
+        return self.algorithm_index.get(name)
+
     def read_datasets(self, dataset_file_name):
         with open(dataset_file_name, 'r') as file:
             for line in file:
@@ -47,47 +63,42 @@ class Records:
                 data = line.strip().split(', ')
                 algorithm_name = data[0]
                 results = data[1:]
-                algorithm = next((alg for alg in self.algorithms if alg.name == algorithm_name), None)
+                algorithm = self.get_algorithm(algorithm_name)
                 if algorithm:
                     for i, result in enumerate(results):
                         dataset_id, result_value = result.split(': ')
                         if dataset_id == '404':
                             result_value = '--'
-                        dataset = next((ds for ds in self.datasets if ds.dataset_id == dataset_id), None)
+                        dataset = self.get_dataset(dataset_id)
                         if dataset:
                             self.results[(algorithm, dataset)] = result_value
 
     def display_results(self):
-        print("RESULTS")
-        header = "| Algorithms"
-        for dataset in self.datasets:
-            header += f" {dataset.dataset_id}"
-        header += " |"
-        print(header)
+        # Lines are collected and written at once; each row is joined once instead of grown with +=
+        lines = ["RESULTS\n", f"| {' '.join(['Algorithms'] + [dataset.dataset_id for dataset in self.datasets])} |\n"]
         for algorithm in self.algorithms:
-            result_line = f"| {algorithm.name}"
+            cells = [algorithm.name]
             for dataset in self.datasets:
                 result = self.results.get((algorithm, dataset))
                 if result is None or result == '':
-                    result_line += " XX"
+                    cells.append("XX")
                 elif result == '404':
-                    result_line += " --"
+                    cells.append("--")
                 else:
-                    result_line += f" {result}"
-            result_line += " |"
-            print(result_line)
+                    cells.append(f"{result}")
+            lines.append(f"| {' '.join(cells)} |\n")
 
         total_algorithms = len(self.algorithms)
         total_datasets = len(self.datasets)
         nonexistent_results = sum(1 for result in self.results.values() if result == 'XX' or result is None or result == '')
         ongoing_results = sum(1 for result in self.results.values() if result == '--' or result == '404')
 
-        print("\nRESULTS SUMMARY")
-        print(f"There are {total_algorithms} algorithms and {total_datasets} datasets.")
-        print(f"The number of nonexistent results is {nonexistent_results} and ongoing results is {ongoing_results}")
+        lines.append("\nRESULTS SUMMARY\n")
+        lines.append(f"There are {total_algorithms} algorithms and {total_datasets} datasets.\n")
+        lines.append(f"The number of nonexistent results is {nonexistent_results} and ongoing results is {ongoing_results}\n")
+        sys.stdout.writelines(lines)
 
 if __name__ == "__main__":
-    import sys
     if len(sys.argv) != 4:
         print("Usage: python my_record.py <algorithm_file_name> <result_file_name> <dataset_file_name>")
     else:
@@ -1,3 +1,5 @@
+import sys
+
 class Dataset:
     def __init__(self, dataset_id, name, weight, size, source):
         self.dataset_id = dataset_id
@@ -24,13 +26,27 @@ class Records:
         self.datasets = []
         self.algorithms = []
         self.results = {}
+        self.dataset_index = {}
+        self.algorithm_index = {}
 
     def add_dataset(self, dataset):
+        if dataset.dataset_id in self.dataset_index:
+            raise ValueError(f"Duplicate dataset ID: {dataset.dataset_id}")
+        self.dataset_index[dataset.dataset_id] = dataset
         self.datasets.append(dataset)
 
     def add_algorithm(self, algorithm):
+        if algorithm.name in self.algorithm_index:
+            raise ValueError(f"Duplicate algorithm name: {algorithm.name}")
+        self.algorithm_index[algorithm.name] = algorithm
         self.algorithms.append(algorithm)
 
+    def get_dataset(self, dataset_id):
+        return self.dataset_index.get(dataset_id)
+
+    def get_algorithm(self, name):
+        return self.algorithm_index.get(name)
+
     def read_datasets(self, dataset_file_name):
         with open(dataset_file_name, 'r') as file:
             for line in file:
@@ -53,13 +69,13 @@ class Records:
                 data = line.strip().split(', ')
                 algorithm_name = data[0]
                 results = data[1:]
-                algorithm = next((alg for alg in self.algorithms if alg.name == algorithm_name), None)
+                algorithm = self.get_algorithm(algorithm_name)
                 if algorithm:
                     for i, result in enumerate(results):
                         dataset_id, result_value = result.split(': ')
                         if dataset_id == '404':
                             result_value = '--'
-                        dataset = next((ds for ds in self.datasets if ds.dataset_id == dataset_id), None)
+                        dataset = self.get_dataset(dataset_id)
                         if dataset:
                             self.results[(algorithm, dataset)] = result_value
 
@@ -74,72 +90,67 @@ class Records:
             dataset.range = f"{round(min(complete_results), 1)} - {round(max(complete_results), 1)}" if complete_results else '-'
 
     def find_most_difficult_dataset(self):
-        difficult_datasets = [dataset for dataset in self.datasets if dataset.average == min(ds.average for ds in self.datasets)]
+        min_average = min((ds.average for ds in self.datasets), default=None)
+        difficult_datasets = [dataset for dataset in self.datasets if dataset.average == min_average]
         return difficult_datasets
 
     def find_most_failed_dataset(self):
-        failed_datasets = [dataset for dataset in self.datasets if dataset.nfail == max(ds.nfail for ds in self.datasets)]
+        max_nfail = max((ds.nfail for ds in self.datasets), default=None)
+        failed_datasets = [dataset for dataset in self.datasets if dataset.nfail == max_nfail]
         return failed_datasets
 
     def display_results(self):
-        print("RESULTS")
-        header = "| Algorithms"
-        for dataset in self.datasets:
-            header += f" {dataset.dataset_id}"
-        header += " |"
-        print(header)
+        # Lines are collected and written at once; each row is joined once instead of grown with +=
+        lines = ["RESULTS\n", f"| {' '.join(['Algorithms'] + [dataset.dataset_id for dataset in self.datasets])} |\n"]
         for algorithm in self.algorithms:
-            result_line = f"| {algorithm.name}"
+            cells = [algorithm.name]
             for dataset in self.datasets:
                 result = self.results.get((algorithm, dataset))
                 if result is None or result == '':
-                    result_line += " XX"
+                    cells.append("XX")
                 elif result == '404':
-                    result_line += " --"
+                    cells.append("--")
                 else:
-                    result_line += f" {result}"
-            result_line += " |"
-            print(result_line)
+                    cells.append(f"{result}")
+            lines.append(f"| {' '.join(cells)} |\n")
 
         total_algorithms = len(self.algorithms)
         total_datasets = len(self.datasets)
         nonexistent_results = sum(1 for result in self.results.values() if result == 'XX' or result is None or result == '')
         ongoing_results = sum(1 for result in self.results.values() if result == '--' or result == '404')
 
-        print("\nRESULTS SUMMARY")
-        print(f"There are {total_algorithms} algorithms and {total_datasets} datasets.")
-        print(f"The number of nonexistent results is {nonexistent_results} and ongoing results is {ongoing_results}")
+        lines.append("\nRESULTS SUMMARY\n")
+        lines.append(f"There are {total_algorithms} algorithms and {total_datasets} datasets.\n")
+        lines.append(f"The number of nonexistent results is {nonexistent_results} and ongoing results is {ongoing_results}\n")
+        sys.stdout.writelines(lines)
 
     def display_dataset_information(self):
         self.compute_statistics()
-        print("\nDATASET INFORMATION")
-        header = "| DatasetID Name Type Weight Ndata Source Average Range Nfail |"
-        print(header)
+        lines = ["\nDATASET INFORMATION\n", "| DatasetID Name Type Weight Ndata Source Average Range Nfail |\n"]
         for dataset in self.datasets:
-            dataset_line = f"| {dataset.dataset_id} {dataset.name} {dataset.type} {dataset.weight} {dataset.size} {dataset.source} {dataset.average} {dataset.range} {dataset.nfail} |"
-            print(dataset_line)
+            lines.append(f"| {dataset.dataset_id} {dataset.name} {dataset.type} {dataset.weight} {dataset.size} {dataset.source} {dataset.average} {dataset.range} {dataset.nfail} |\n")
 
         most_difficult_datasets = self.find_most_difficult_dataset()
         most_failed_datasets = self.find_most_failed_dataset()
 
-        print("\nDATASET SUMMARY")
+        lines.append("\nDATASET SUMMARY\n")
         if len(most_difficult_datasets) == 1:
-            print(f"The most difficult dataset is {most_difficult_datasets[0].name} with an average result of {most_difficult_datasets[0].average}.")
+            lines.append(f"The most difficult dataset is {most_difficult_datasets[0].name} with an average result of {most_difficult_datasets[0].average}.\n")
         else:
-            print("The most difficult dataset is:")
+            lines.append("The most difficult dataset is:\n")
             for dataset in most_difficult_datasets:
-                print(f"- {dataset.name} with an average result of {dataset.average}.")
+                lines.append(f"- {dataset.name} with an average result of {dataset.average}.\n")
 
         if len(most_failed_datasets) == 1:
-            print(f"The dataset with the most failures is {most_failed_datasets[0].name} with the number of failures being {most_failed_datasets[0].nfail}.")
+            lines.append(f"The dataset with the most failures is {most_failed_datasets[0].name} with the number of failures being {most_failed_datasets[0].nfail}.\n")
         else:
-            print("The dataset with the most failures is:")
+            lines.append("The dataset with the most failures is:\n")
             for dataset in most_failed_datasets:
-                print(f"- {dataset.name} with the number of failures being {dataset.nfail}.")
+                lines.append(f"- {dataset.name} with the number of failures being {dataset.nfail}.\n")
+        sys.stdout.writelines(lines)
 
 
 if __name__ == "__main__":
-    import sys
     if len(sys.argv) != 4:
         print("Usage: python my_record.py <algorithm_file_name> <result_file_name> <dataset_file_name>")
     else:
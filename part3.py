@@ -1,3 +1,5 @@
+import sys
+
 class Dataset:
     def __init__(self, dataset_id, name, weight, size, source):
         self.dataset_id = dataset_id
@@ -54,12 +56,30 @@ class Records:
         self.datasets = []
         self.algorithms = []
         self.results = {}
+        self.dataset_index = {}
+        self.algorithm_index = {}
+        # Set by compute_all_statistics and cleared whenever the grid changes, so the display methods share one pass
+        self.statistics_computed = False
 
     def add_dataset(self, dataset):
+        if dataset.dataset_id in self.dataset_index:
+            raise ValueError(f"Duplicate dataset ID: {dataset.dataset_id}")
+        self.dataset_index[dataset.dataset_id] = dataset
         self.datasets.append(dataset)
+        self.statistics_computed = False
 
     def add_algorithm(self, algorithm):
+        if algorithm.name in self.algorithm_index:
+            raise ValueError(f"Duplicate algorithm name: {algorithm.name}")
+        self.algorithm_index[algorithm.name] = algorithm
         self.algorithms.append(algorithm)
+        self.statistics_computed = False
+
+    def get_dataset(self, dataset_id):
+        return self.dataset_index.get(dataset_id)
+
+    def get_algorithm(self, name):
+        return self.algorithm_index.get(name)
 
     def read_datasets(self, dataset_file_name):
         with open(dataset_file_name, 'r') as file:
@@ -78,18 +98,19 @@ class Records:
                 self.add_algorithm(algorithm)
 
     def read_results(self, result_file_name):
+        self.statistics_computed = False
         with open(result_file_name, 'r') as file:
             for line in file:
                 data = line.strip().split(', ')
                 algorithm_name = data[0]
                 results = data[1:]
-                algorithm = next((alg for alg in self.algorithms if alg.name == algorithm_name), None)
+                algorithm = self.get_algorithm(algorithm_name)
                 if algorithm:
                     for i, result in enumerate(results):
                         dataset_id, result_value = result.split(': ')
                         if dataset_id == '404':
                             result_value = '--'
-                        dataset = next((ds for ds in self.datasets if ds.dataset_id == dataset_id), None)
+                        dataset = self.get_dataset(dataset_id)
                         if dataset:
                             self.results[(algorithm, dataset)] = result_value
 
@@ -103,91 +124,123 @@ class Records:
             dataset.average = round(sum(complete_results) / len(complete_results), 1) if complete_results else '-'
             dataset.range = f"{round(min(complete_results), 1)} - {round(max(complete_results), 1)}" if complete_results else '-'
 
+    def compute_all_statistics(self):
+        # One pass over the grid fills both the dataset and the algorithm statistics
+        if self.statistics_computed:
+            return
+        ongoing_results = sum(1 for result in self.results.values() if result in ('XX', None, '', '--'))
+        dataset_results = [[] for _ in self.datasets]
+        dataset_nfail = [0] * len(self.datasets)
+        for algorithm in self.algorithms:
+            complete_results = []
+            fail_datasets = []
+            for j, dataset in enumerate(self.datasets):
+                result = self.results.get((algorithm, dataset))
+                if result in ('XX', None, ''):
+                    dataset_nfail[j] += 1
+                    continue
+                if result == '--':
+                    continue
+                # Algorithm.compute_statistics averages failed ('404') results as well
+                value = float(result)
+                complete_results.append(value)
+                if result == '404':
+                    dataset_nfail[j] += 1
+                    fail_datasets.append(f"{dataset.dataset_id} ({result})")
+                else:
+                    dataset_results[j].append(value)
+            algorithm.ongoing_results = ongoing_results
+            algorithm.fail_datasets = fail_datasets
+            algorithm.nfail = len(fail_datasets)
+            if complete_results:
+                algorithm.average = round(sum(complete_results) / len(complete_results), 1)
+        for dataset, complete_results, nfail in zip(self.datasets, dataset_results, dataset_nfail):
+            dataset.nfail = nfail
+            dataset.average = round(sum(complete_results) / len(complete_results), 1) if complete_results else '-'
+            dataset.range = f"{round(min(complete_results), 1)} - {round(max(complete_results), 1)}" if complete_results else '-'
+        self.statistics_computed = True
+
     def find_most_difficult_dataset(self):
-        difficult_datasets = [dataset for dataset in self.datasets if dataset.average == min(ds.average for ds in self.datasets)]
+        min_average = min((ds.average for ds in self.datasets), default=None)
+        difficult_datasets = [dataset for dataset in self.datasets if dataset.average == min_average]
         return difficult_datasets
 
     def find_most_failed_dataset(self):
-        failed_datasets = [dataset for dataset in self.datasets if dataset.nfail == max(ds.nfail for ds in self.datasets)]
+        max_nfail = max((ds.nfail for ds in self.datasets), default=None)
+        failed_datasets = [dataset for dataset in self.datasets if dataset.nfail == max_nfail]
         return failed_datasets
 
     def display_results(self):
-        print("RESULTS")
-        header = "| Algorithms"
-        for dataset in self.datasets:
-            header += f" {dataset.dataset_id}"
-        header += " |"
-        print(header)
+        # Lines are collected and written at once; each row is joined once instead of grown with +=
+        lines = ["RESULTS\n", f"| {' '.join(['Algorithms'] + [dataset.dataset_id for dataset in self.datasets])} |\n"]
         for algorithm in self.algorithms:
-            result_line = f"| {algorithm.name}"
+            cells = [algorithm.name]
             for dataset in self.datasets:
                 result = self.results.get((algorithm, dataset))
                 if result is None or result == '':
-                    result_line += " XX"
+                    cells.append("XX")
                 elif result == '404':
-                    result_line += " --"
+                    cells.append("--")
                 else:
-                    result_line += f" {result}"
-            result_line += " |"
-            print(result_line)
+                    cells.append(f"{result}")
+            lines.append(f"| {' '.join(cells)} |\n")
 
         total_algorithms = len(self.algorithms)
         total_datasets = len(self.datasets)
         nonexistent_results = sum(1 for result in self.results.values() if result == 'XX' or result is None or result == '')
         ongoing_results = sum(1 for result in self.results.values() if result == '--' or result == '404')
 
-        print("\nRESULTS SUMMARY")
-        print(f"There are {total_algorithms} algorithms and {total_datasets} datasets.")
-        print(f"The number of nonexistent results is {nonexistent_results} and ongoing results is {ongoing_results}")
+        lines.append("\nRESULTS SUMMARY\n")
+        lines.append(f"There are {total_algorithms} algorithms and {total_datasets} datasets.\n")
+        lines.append(f"The number of nonexistent results is {nonexistent_results} and ongoing results is {ongoing_results}\n")
+        sys.stdout.writelines(lines)
 
     def display_dataset_information(self):
-        self.compute_statistics()
-        print("\nDATASET INFORMATION")
-        header = "| DatasetID Name Type Weight Ndata Source Average Range Nfail |"
-        print(header)
+        self.compute_all_statistics()
+        lines = ["\nDATASET INFORMATION\n", "| DatasetID Name Type Weight Ndata Source Average Range Nfail |\n"]
         for dataset in self.datasets:
-            dataset_line = f"| {dataset.dataset_id} {dataset.name} {dataset.type} {dataset.weight} {dataset.size} {dataset.source} {dataset.average} {dataset.range} {dataset.nfail} |"
-            print(dataset_line)
+            lines.append(f"| {dataset.dataset_id} {dataset.name} {dataset.type} {dataset.weight} {dataset.size} {dataset.source} {dataset.average} {dataset.range} {dataset.nfail} |\n")
 
         most_difficult_datasets = self.find_most_difficult_dataset()
         most_failed_datasets = self.find_most_failed_dataset()
 
-        print("\nDATASET SUMMARY")
+        lines.append("\nDATASET SUMMARY\n")
         if len(most_difficult_datasets) == 1:
-            print(f"The most difficult dataset is {most_difficult_datasets[0].name} with an average result of {most_difficult_datasets[0].average}.")
+            lines.append(f"The most difficult dataset is {most_difficult_datasets[0].name} with an average result of {most_difficult_datasets[0].average}.\n")
         else:
-            print("The most difficult dataset is:")
+            lines.append("The most difficult dataset is:\n")
             for dataset in most_difficult_datasets:
-                print(f"- {dataset.name} with an average result of {dataset.average}.")
+                lines.append(f"- {dataset.name} with an average result of {dataset.average}.\n")
 
         if len(most_failed_datasets) == 1:
-            print(f"The dataset with the most failures is {most_failed_datasets[0].name} with the number of failures being {most_failed_datasets[0].nfail}.")
+            lines.append(f"The dataset with the most failures is {most_failed_datasets[0].name} with the number of failures being {most_failed_datasets[0].nfail}.\n")
         else:
-            print("The dataset with the most failures is:")
+            lines.append("The dataset with the most failures is:\n")
             for dataset in most_failed_datasets:
-                print(f"- {dataset.name} with the number of failures being {dataset.nfail}.")
+                lines.append(f"- {dataset.name} with the number of failures being {dataset.nfail}.\n")
+        sys.stdout.writelines(lines)
 
     def display_algorithm_information(self):
-        print("\nALGORITHM INFORMATION")
-        header = "| Name Туре Year Authors Average Nfail FailDataset Nongoing |"
-        print(header)
+        lines = ["\nALGORITHM INFORMATION\n", "| Name Туре Year Authors Average Nfail FailDataset Nongoing |\n"]
+        self.compute_all_statistics()
         for algorithm in self.algorithms:
-            algorithm.compute_statistics(self.results, self.datasets)
-            print(algorithm)
+            lines.append(f"{algorithm}\n")
 
-        best_algorithms = [alg for alg in self.algorithms if alg.average == max(alg.average for alg in self.algorithms)]
-        least_failure_algorithms = [alg for alg in self.algorithms if alg.nfail == min(alg.nfail for alg in self.algorithms)]
+        max_average = max((alg.average for alg in self.algorithms), default=None)
+        min_nfail = min((alg.nfail for alg in self.algorithms), default=None)
+        best_algorithms = [alg for alg in self.algorithms if alg.average == max_average]
+        least_failure_algorithms = [alg for alg in self.algorithms if alg.nfail == min_nfail]
 
         best_algorithm_names = ', '.join(alg.name for alg in best_algorithms)
         least_failure_algorithm_names = ', '.join(alg.name for alg in least_failure_algorithms)
 
-        print("\nALGORITHM SUMMARY")
-        print(f"The best algorithm{'s' if len(best_algorithms) > 1 else ''} is {best_algorithm_names} with an average result of {best_algorithms[0].average}.")
-        print(f"The algorithm{'s' if len(least_failure_algorithms) > 1 else ''} with the least failure{'s' if len(least_failure_algorithms) > 1 else ''} is {least_failure_algorithm_names} with the number of failures being {least_failure_algorithms[0].nfail}.")
+        lines.append("\nALGORITHM SUMMARY\n")
+        lines.append(f"The best algorithm{'s' if len(best_algorithms) > 1 else ''} is {best_algorithm_names} with an average result of {best_algorithms[0].average}.\n")
+        lines.append(f"The algorithm{'s' if len(least_failure_algorithms) > 1 else ''} with the least failure{'s' if len(least_failure_algorithms) > 1 else ''} is {least_failure_algorithm_names} with the number of failures being {least_failure_algorithms[0].nfail}.\n")
+        sys.stdout.writelines(lines)
 
 
 if __name__ == "__main__":
-    import sys
     if len(sys.argv) != 4:
         print("Usage: python my_record.py <result_file_name> <dataset_file_name> <algorithm_file_name>")
     else:
@@ -1,4 +1,21 @@
+import bisect
 import datetime
+import functools
+import glob
+import hashlib
+import heapq
+import json
+import math
+import os
+import random
+import re
+import struct
+import sys
+import time
+from array import array
+from collections import Counter, OrderedDict
+from itertools import compress, repeat
+from operator import and_, itemgetter, rshift
 
 class FileFormatError(Exception):
     pass
@@ -9,24 +26,36 @@ class InvalidDatasetIDError(Exception):
 class InvalidResultError(Exception):
     pass
 
+class DuplicateEntryError(Exception):
+    pass
+
+class LoadError(Exception):
+    def __init__(self, errors):
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
 class Dataset:
+    __slots__ = ('dataset_id', 'name', 'weight', 'size', 'source', 'type', 'average', 'range', 'nfail')
+
     def __init__(self, dataset_id, name, weight, size, source):
-        self.dataset_id = dataset_id
-        self.name = name
+        self.dataset_id = sys.intern(dataset_id)
+        self.name = sys.intern(name)
         self.weight = weight
         self.size = size
-        self.source = source
+        self.source = sys.intern(source)
         self.type = 'S' if dataset_id[-1] == 'S' else 'A'
         self.average = None
         self.range = None
         self.nfail = None
 
 class Algorithm:
+    __slots__ = ('name', 'category', 'year', 'authors', 'average', 'nfail', 'fail_datasets', 'ongoing_results', 'score')
+
     def __init__(self, name, category, year, authors):
-        self.name = name
-        self.category = category
+        self.name = sys.intern(name)
+        self.category = sys.intern(category)
         self.year = year
-        self.authors = authors
+        self.authors = [sys.intern(author) for author in authors]
         self.average = 0
         self.nfail = 0
         self.fail_datasets = []
@@ -54,64 +83,1690 @@ class Algorithm:
         fail_dataset_str = ', '.join(self.fail_datasets)
         return f"| {name:<12} {self.category:<4} {self.year:<4} {authors_str:<20} {self.average:^7.1f} {self.nfail:^5} {fail_dataset_str:<12} {self.ongoing_results:^7} {self.score:^5} |"
 
-class Records:
+class PackedResults:
+    # Drop-in for the results dict: each (algorithm, dataset) key is stored as one packed int and values are interned
     def __init__(self):
+        self.cells = {}
+        self.algorithms = []
+        self.datasets = []
+        self.algorithm_ids = {}
+        self.dataset_ids = {}
+
+    def pack(self, key, create=False):
+        algorithm, dataset = key
+        row = self.algorithm_ids.get(algorithm)
+        col = self.dataset_ids.get(dataset)
+        if create:
+            if row is None:
+                row = self.algorithm_ids[algorithm] = len(self.algorithms)
+                self.algorithms.append(algorithm)
+            if col is None:
+                col = self.dataset_ids[dataset] = len(self.datasets)
+                self.datasets.append(dataset)
+        elif row is None or col is None:
+            return None
+        return row << 32 | col
+
+    @classmethod
+    def from_columns(cls, algorithms, datasets, rows, cols, values):
+        # rows and cols index into algorithms and datasets, which must hold no duplicates
+        packed = cls()
+        packed.algorithms = list(algorithms)
+        packed.datasets = list(datasets)
+        packed.algorithm_ids = {algorithm: i for i, algorithm in enumerate(packed.algorithms)}
+        packed.dataset_ids = {dataset: j for j, dataset in enumerate(packed.datasets)}
+        packed.cells = dict(zip(map(int.__or__, map((1 << 32).__mul__, rows), cols), values))
+        return packed
+
+    def unpack(self, cell):
+        return self.algorithms[cell >> 32], self.datasets[cell & 0xFFFFFFFF]
+
+    def __setitem__(self, key, value):
+        self.cells[self.pack(key, create=True)] = sys.intern(value) if isinstance(value, str) else value
+
+    def __getitem__(self, key):
+        cell = self.pack(key)
+        if cell is None:
+            raise KeyError(key)
+        return self.cells[cell]
+
+    def get(self, key, default=None):
+        cell = self.pack(key)
+        return default if cell is None else self.cells.get(cell, default)
+
+    def __contains__(self, key):
+        cell = self.pack(key)
+        return cell is not None and cell in self.cells
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return (self.unpack(cell) for cell in self.cells)
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        return self.cells.values()
+
+    def items(self):
+        return ((self.unpack(cell), value) for cell, value in self.cells.items())
+
+class SparseResults:
+    # Drop-in for the results dict that keeps only present cells, indexed both per algorithm (CSR-style rows)
+    # and per dataset (CSC-style columns), so statistics can walk a row or column without touching absent cells
+    def __init__(self):
+        self.rows = {}
+        self.columns = {}
+        self.count = 0
+
+    def __setitem__(self, key, value):
+        algorithm, dataset = key
+        row = self.rows.get(algorithm)
+        if row is None:
+            row = self.rows[algorithm] = {}
+        if dataset not in row:
+            self.count += 1
+        row[dataset] = value
+        column = self.columns.get(dataset)
+        if column is None:
+            column = self.columns[dataset] = {}
+        column[algorithm] = value
+
+    def __getitem__(self, key):
+        algorithm, dataset = key
+        return self.rows[algorithm][dataset]
+
+    def get(self, key, default=None):
+        algorithm, dataset = key
+        row = self.rows.get(algorithm)
+        return default if row is None else row.get(dataset, default)
+
+    def __contains__(self, key):
+        algorithm, dataset = key
+        return dataset in self.rows.get(algorithm, ())
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return ((algorithm, dataset) for algorithm, row in self.rows.items() for dataset in row)
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        return (value for row in self.rows.values() for value in row.values())
+
+    def items(self):
+        return (((algorithm, dataset), value) for algorithm, row in self.rows.items() for dataset, value in row.items())
+
+    @staticmethod
+    def ordered(cells, positions):
+        # Present cells in grid order, so sums add up in the same order as a dense pass
+        return sorted(cells.items(), key=lambda item: positions[item[0]])
+
+    def row_items(self, algorithm, dataset_positions):
+        return self.ordered(self.rows.get(algorithm, {}), dataset_positions)
+
+    def column_items(self, dataset, algorithm_positions):
+        return self.ordered(self.columns.get(dataset, {}), algorithm_positions)
+
+class SnapshotResults:
+    # Results of a snapshot or a parallel read kept as row, col and value-id columns, with no repeated cell. The packed per-cell dict is only built on the
+    # first lookup or write, so a warm start does no per-result work and whole-table passes read the columns.
+    def __init__(self, algorithms, datasets, rows, cols, value_ids, values):
+        self.algorithms = algorithms
+        self.datasets = datasets
+        self.rows = rows
+        self.cols = cols
+        self.value_ids = value_ids
+        self.value_table = values
+        self.packed = None
+
+    def materialize(self):
+        if self.packed is None:
+            self.packed = PackedResults.from_columns(self.algorithms, self.datasets, self.rows, self.cols, map(self.value_table.__getitem__, self.value_ids))
+        return self.packed
+
+    def __setitem__(self, key, value):
+        self.materialize()[key] = value
+
+    def __getitem__(self, key):
+        return self.materialize()[key]
+
+    def get(self, key, default=None):
+        return self.materialize().get(key, default)
+
+    def __contains__(self, key):
+        return key in self.materialize()
+
+    def __len__(self):
+        return len(self.rows) if self.packed is None else len(self.packed)
+
+    def __iter__(self):
+        return (key for key, _ in self.items())
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        if self.packed is not None:
+            return self.packed.values()
+        return map(self.value_table.__getitem__, self.value_ids)
+
+    def items(self):
+        if self.packed is not None:
+            return self.packed.items()
+        algorithms = self.algorithms
+        datasets = self.datasets
+        values = self.value_table
+        return (((algorithms[row], datasets[col]), values[value_id]) for row, col, value_id in zip(self.rows, self.cols, self.value_ids))
+
+SCORE_WEIGHTS = (3, 2, 1)
+
+def top_rank_score(scores, weights=SCORE_WEIGHTS):
+    # scores holds the complete results of one row; missing, failed and ongoing cells are never ranked.
+    # The highest distinct value earns weights[0] per dataset that reaches it, the next distinct value weights[1], ...
+    # Tied datasets are counted once and rows with fewer distinct values than weights simply score fewer ranks.
+    counts = Counter(scores)
+    return sum(weight * counts[value] for weight, value in zip(weights, heapq.nlargest(len(weights), counts)))
+
+class ResultMatrix:
+    OK = 0
+    MISSING = 1
+    FAILED = 2
+    ONGOING = 3
+
+    def __init__(self, algorithms, datasets, results):
+        self.algorithms = algorithms
+        self.datasets = datasets
+        self.ncols = len(datasets)
+        size = len(algorithms) * self.ncols
+        self.values = array('d', bytes(8 * size))
+        self.status = array('b', [self.MISSING]) * size
+        # Number of stored entries that are 'XX', '' or '--', kept for Algorithm.ongoing_results
+        self.stored_incomplete = 0
+        if isinstance(results, SnapshotResults) and results.packed is None and results.algorithms is algorithms and results.datasets is datasets:
+            # Snapshot columns already hold grid positions, and each distinct value is classified once
+            classified = [self.classify(result) for result in results.value_table]
+            for row, col, value_id in zip(results.rows, results.cols, results.value_ids):
+                index = row * self.ncols + col
+                status, value = classified[value_id]
+                self.status[index] = status
+                if status == self.OK:
+                    self.values[index] = value
+                elif status != self.FAILED:
+                    self.stored_incomplete += 1
+            return
+        rows = {algorithm: i for i, algorithm in enumerate(algorithms)}
+        cols = {dataset: j for j, dataset in enumerate(datasets)}
+        for (algorithm, dataset), result in results.items():
+            index = rows[algorithm] * self.ncols + cols[dataset]
+            status, value = self.classify(result)
+            self.status[index] = status
+            if status == self.OK:
+                self.values[index] = value
+            elif status != self.FAILED:
+                self.stored_incomplete += 1
+
+    @staticmethod
+    def classify(result):
+        if result in ('XX', None, ''):
+            return ResultMatrix.MISSING, None
+        if result == '--':
+            return ResultMatrix.ONGOING, None
+        if result == '404':
+            return ResultMatrix.FAILED, None
+        return ResultMatrix.OK, float(result)
+
+    def row(self, i):
+        start = i * self.ncols
+        return self.values[start:start + self.ncols], self.status[start:start + self.ncols]
+
+    def column(self, j):
+        return self.values[j::self.ncols], self.status[j::self.ncols]
+
+    def compute_dataset_statistics(self):
+        for j, dataset in enumerate(self.datasets):
+            values, status = self.column(j)
+            count = status.count(self.OK)
+            dataset.nfail = status.count(self.MISSING) + status.count(self.FAILED)
+            if count:
+                # Cells that are not OK hold 0.0, so the plain column sum equals the sum of complete results
+                complete_results = list(compress(values, [code == self.OK for code in status]))
+                dataset.average = round(sum(values) / count, 1)
+                dataset.range = f"{round(min(complete_results), 1)} - {round(max(complete_results), 1)}"
+            else:
+                dataset.average = '-'
+                dataset.range = '-'
+
+    def compute_algorithm_statistics(self):
+        for i, algorithm in enumerate(self.algorithms):
+            values, status = self.row(i)
+            count = status.count(self.OK)
+            algorithm.ongoing_results = self.stored_incomplete
+            algorithm.fail_datasets = [f"{dataset.dataset_id} (404)" for dataset, code in zip(self.datasets, status) if code == self.FAILED]
+            algorithm.nfail = len(algorithm.fail_datasets)
+            if count:
+                algorithm.average = round(sum(values) / count, 1)
+
+    def compute_scores(self, weights=SCORE_WEIGHTS):
+        for i, algorithm in enumerate(self.algorithms):
+            values, status = self.row(i)
+            algorithm.score = top_rank_score(compress(values, [code == self.OK for code in status]), weights)
+
+def optional_numpy():
+    # NumPy backs the columnar ResultMatrix when it is installed; it is imported only when a matrix is first built
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+class ValueIds(dict):
+    # Distinct result value -> its number, assigned on first lookup, so a whole column of values maps in C
+    def __missing__(self, value):
+        value_id = self[value] = len(self)
+        return value_id
+
+def int_column(items, count):
+    return array('i', items)
+
+def result_entries(algorithms, datasets, results, column=int_column):
+    # Grid rows, grid columns and value ids of the stored results as int32 columns built by column(items, count), plus
+    # the distinct values the ids number, gathered without a Python statement per result. Snapshot columns are
+    # returned as they are.
+    if isinstance(results, SnapshotResults) and results.packed is None and results.algorithms is algorithms and results.datasets is datasets:
+        return results.rows, results.cols, results.value_ids, results.value_table
+    count = len(results)
+    row_index = {algorithm: i for i, algorithm in enumerate(algorithms)}
+    col_index = {dataset: j for j, dataset in enumerate(datasets)}
+    value_ids = ValueIds()
+    if isinstance(results, PackedResults):
+        packed_rows = [row_index[algorithm] for algorithm in results.algorithms]
+        packed_cols = [col_index[dataset] for dataset in results.datasets]
+        rows = column(map(packed_rows.__getitem__, map(rshift, results.cells.keys(), repeat(32))), count)
+        cols = column(map(packed_cols.__getitem__, map(and_, results.cells.keys(), repeat(0xFFFFFFFF))), count)
+    else:
+        rows = column(map(row_index.__getitem__, map(itemgetter(0), results.keys())), count)
+        cols = column(map(col_index.__getitem__, map(itemgetter(1), results.keys())), count)
+    ids = column(map(value_ids.__getitem__, results.values()), count)
+    return rows, cols, ids, list(value_ids)
+
+def numpy_rounded_averages(np, totals, counts, minimum, maximum, grid_values):
+    # Python's round(sum / count, 1) per entity, where sum adds the complete values in grid order. NumPy's total is
+    # used unless the mean lies so close to a .x5 boundary that the two summation orders could round apart; only
+    # then are the values of that entity fetched with grid_values(k) and summed in Python.
+    means = totals / np.maximum(counts, 1)
+    tenths = means * 10
+    with np.errstate(invalid='ignore'):
+        largest = np.maximum(np.abs(minimum), np.abs(maximum))
+        clear = np.abs(tenths - np.floor(tenths) - 0.5) / 10 > (2 * counts + 8) * 2.0 ** -52 * largest
+    averages = []
+    for k, (count, mean, is_clear) in enumerate(zip(counts.tolist(), means.tolist(), clear.tolist())):
+        if not count:
+            averages.append(None)
+        elif is_clear:
+            averages.append(round(mean, 1))
+        else:
+            averages.append(round(sum(grid_values(k)) / count, 1))
+    return averages
+
+def numpy_extremes(np, values, ok, axis):
+    return np.where(ok, values, np.inf).min(axis=axis, initial=np.inf), np.where(ok, values, -np.inf).max(axis=axis, initial=-np.inf)
+
+def numpy_dataset_statistics(np, values, status, start=0):
+    # (column, nfail, average, range) for every column of the (algorithms, datasets) grids, as _dataset_statistics_shard
+    ok = status == ResultMatrix.OK
+    counts = np.count_nonzero(ok, axis=0)
+    nfail = np.count_nonzero((status == ResultMatrix.MISSING) | (status == ResultMatrix.FAILED), axis=0).tolist()
+    minimum, maximum = numpy_extremes(np, values, ok, 0)
+    # Cells that are not OK hold 0.0, so the plain column sums are the sums of complete results
+    averages = numpy_rounded_averages(np, values.sum(axis=0), counts, minimum, maximum, lambda j: values[:, j][ok[:, j]].tolist())
+    statistics = []
+    for j, (average, low, high) in enumerate(zip(averages, minimum.tolist(), maximum.tolist())):
+        if average is None:
+            statistics.append((start + j, nfail[j], '-', '-'))
+        else:
+            statistics.append((start + j, nfail[j], average, f"{round(low, 1)} - {round(high, 1)}"))
+    return statistics
+
+def numpy_algorithm_statistics(np, values, status, start=0):
+    # (row, fail columns, average or None) for every row of the grids, as _algorithm_statistics_shard without the score
+    ok = status == ResultMatrix.OK
+    counts = np.count_nonzero(ok, axis=1)
+    minimum, maximum = numpy_extremes(np, values, ok, 1)
+    averages = numpy_rounded_averages(np, values.sum(axis=1), counts, minimum, maximum, lambda i: values[i][ok[i]].tolist())
+    fail_columns = [[] for _ in averages]
+    for i, j in zip(*(index.tolist() for index in np.nonzero(status == ResultMatrix.FAILED))):
+        fail_columns[i].append(j)
+    return [(start + i, fail_columns[i], average) for i, average in enumerate(averages)]
+
+def numpy_masked_top_rank_scores(np, values, status, weights):
+    # top_rank_score of every row: each round takes the row maxima over complete cells, counts the cells tied at them
+    # and knocks those cells out, so round k sees the k-th distinct value
+    remaining = np.where(status == ResultMatrix.OK, values, -np.inf)
+    scores = np.zeros(remaining.shape[0], dtype=np.int64)
+    for weight in weights:
+        top = remaining.max(axis=1, initial=-np.inf)
+        tied = remaining == top[:, None]
+        # Rows with no value left have top -inf and score nothing more
+        scores += weight * np.count_nonzero(tied, axis=1) * (top > -np.inf)
+        remaining[tied] = -np.inf
+    return scores
+
+def numpy_top_rank_scores(np, values, status, weights, candidates=32, block_cells=1 << 20):
+    # top_rank_score of every row at once. np.partition moves the largest cells of each row to its end, and only
+    # those candidates are sorted and ranked by distinct value. Cells that are not OK hold 0.0, which no complete
+    # result exceeds from below, so a row is redone with numpy_masked_top_rank_scores only when a ranked value is 0 or
+    # less, or when ties fill the candidates before len(weights) distinct values are seen.
+    rows, columns = values.shape
+    size = min(columns, candidates)
+    scores = []
+    block = max(1, block_cells // max(1, columns))
+    for start in range(0, rows, block):
+        block_values = values[start:start + block]
+        if not size:
+            scores.extend([0] * block_values.shape[0])
+            continue
+        top = np.sort(np.partition(block_values, columns - size, axis=1)[:, columns - size:], axis=1)[:, ::-1]
+        new_value = np.ones(top.shape, dtype=bool)
+        new_value[:, 1:] = top[:, 1:] != top[:, :-1]
+        rank = np.cumsum(new_value, axis=1) - 1
+        block_scores = np.zeros(top.shape[0], dtype=np.int64)
+        for r, weight in enumerate(weights):
+            block_scores += weight * np.count_nonzero(rank == r, axis=1)
+        # Every cell ranked below len(weights) is among the candidates once one of them ranks len(weights) or more
+        complete = rank[:, -1] >= len(weights) if size < columns else np.ones(top.shape[0], dtype=bool)
+        redo = np.flatnonzero(~complete | ((top <= 0) & (rank < len(weights))).any(axis=1))
+        if len(redo):
+            block_scores[redo] = numpy_masked_top_rank_scores(np, block_values[redo], status[start:start + block][redo], weights)
+        scores.extend(block_scores.tolist())
+    return scores
+
+class NumpyResultMatrix(ResultMatrix):
+    # ResultMatrix held in a float64 value grid and an int8 status grid, reduced along whole axes by NumPy.
+    # values and status stay flat like the array('d')/array('b') of the stdlib matrix; grid_values/grid_status are
+    # (algorithms, datasets) views of them.
+    def __init__(self, algorithms, datasets, results, np):
+        self.numpy = np
+        self.algorithms = algorithms
+        self.datasets = datasets
+        self.ncols = len(datasets)
+        self.values = np.zeros(len(algorithms) * self.ncols, dtype=np.float64)
+        self.status = np.full(len(algorithms) * self.ncols, self.MISSING, dtype=np.int8)
+        self.grid_values = self.values.reshape(len(algorithms), self.ncols)
+        self.grid_status = self.status.reshape(len(algorithms), self.ncols)
+        self.fill(*self.entries(results))
+
+    def entries(self, results):
+        np = self.numpy
+        entries = result_entries(self.algorithms, self.datasets, results, lambda items, count: np.fromiter(items, dtype=np.int32, count=count))
+        return tuple(np.frombuffer(column, dtype=np.int32) for column in entries[:3]) + entries[3:]
+
+    def fill(self, rows, cols, value_ids, value_table):
+        np = self.numpy
+        # Each distinct value is classified once and the grids are written with one scatter per array
+        classified = [self.classify(result) for result in value_table]
+        status_table = np.array([status for status, _ in classified], dtype=np.int8)
+        number_table = np.array([0.0 if number is None else number for _, number in classified], dtype=np.float64)
+        index = rows.astype(np.int64) * self.ncols + cols
+        entry_status = status_table[value_ids]
+        self.status[index] = entry_status
+        self.values[index] = number_table[value_ids]
+        # Number of stored entries that are 'XX', '' or '--', kept for Algorithm.ongoing_results
+        self.stored_incomplete = int(np.count_nonzero((entry_status == self.MISSING) | (entry_status == self.ONGOING)))
+
+    def compute_dataset_statistics(self):
+        for j, nfail, average, value_range in numpy_dataset_statistics(self.numpy, self.grid_values, self.grid_status):
+            dataset = self.datasets[j]
+            dataset.nfail = nfail
+            dataset.average = average
+            dataset.range = value_range
+
+    def compute_algorithm_statistics(self):
+        for i, fail_columns, average in numpy_algorithm_statistics(self.numpy, self.grid_values, self.grid_status):
+            algorithm = self.algorithms[i]
+            algorithm.ongoing_results = self.stored_incomplete
+            algorithm.fail_datasets = [f"{self.datasets[j].dataset_id} (404)" for j in fail_columns]
+            algorithm.nfail = len(fail_columns)
+            if average is not None:
+                algorithm.average = average
+
+    def compute_scores(self, weights=SCORE_WEIGHTS):
+        for algorithm, score in zip(self.algorithms, numpy_top_rank_scores(self.numpy, self.grid_values, self.grid_status, weights)):
+            algorithm.score = score
+
+def ranked_values(entities, statistic):
+    # Datasets without complete results have the placeholder average '-', which cannot be ranked
+    for entity in entities:
+        value = getattr(entity, statistic)
+        if value is not None and not isinstance(value, str):
+            yield entity, value
+
+def extreme_entities(entities, statistic, largest):
+    best = []
+    best_value = None
+    for entity, value in ranked_values(entities, statistic):
+        if not best or (value > best_value if largest else value < best_value):
+            best = [entity]
+            best_value = value
+        elif value == best_value:
+            best.append(entity)
+    return best
+
+def top_entities(entities, statistic, k, largest):
+    select = heapq.nlargest if largest else heapq.nsmallest
+    return [entity for entity, value in select(k, ranked_values(entities, statistic), key=lambda pair: pair[1])]
+
+class EntityIndex:
+    # Secondary indexes over datasets or algorithms: attribute value -> entities in the order they were added.
+    # Ranged attributes also keep their distinct values sorted so range lookups only touch the matching groups.
+    def __init__(self, keys, ranged=()):
+        self.keys = keys
+        self.groups = {name: {} for name in keys}
+        self.sorted_values = {name: [] for name in ranged}
+        self.positions = {}
+
+    def add(self, entity):
+        self.positions[entity] = len(self.positions)
+        for name, key in self.keys.items():
+            groups = self.groups[name]
+            for value in key(entity):
+                group = groups.get(value)
+                if group is None:
+                    group = groups[value] = []
+                    if name in self.sorted_values:
+                        bisect.insort(self.sorted_values[name], value)
+                group.append(entity)
+
+    def lookup(self, name, value):
+        return self.groups[name].get(value, [])
+
+    def range(self, name, low=None, high=None):
+        values = self.sorted_values[name]
+        start = 0 if low is None else bisect.bisect_left(values, low)
+        end = len(values) if high is None else bisect.bisect_right(values, high)
+        groups = self.groups[name]
+        return [entity for value in values[start:end] for entity in groups[value]]
+
+    def select(self, equal=(), ranges=()):
+        candidates = [self.lookup(name, value) for name, value in equal if value is not None]
+        candidates += [self.range(name, low, high) for name, low, high in ranges if low is not None or high is not None]
+        if not candidates:
+            return list(self.positions)
+        if len(candidates) == 1 and not ranges:
+            return list(candidates[0])
+        # Intersect starting from the smallest candidate list, then restore insertion order
+        smallest = min(candidates, key=len)
+        others = [set(candidate) for candidate in candidates if candidate is not smallest]
+        selected = [entity for entity in smallest if all(entity in other for other in others)]
+        selected.sort(key=self.positions.__getitem__)
+        return selected
+
+class ResultView:
+    # The results of a subset of algorithms on a subset of datasets, as returned by Records.query
+    def __init__(self, results, algorithms, datasets):
+        self.results = results
+        self.algorithms = algorithms
+        self.datasets = datasets
+
+    def cells(self):
+        for algorithm in self.algorithms:
+            for dataset in self.datasets:
+                result = self.results.get((algorithm, dataset))
+                if result is not None:
+                    yield algorithm, dataset, result
+
+    def complete_values(self):
+        return [value for _, _, result in self.cells() for status, value in (ResultMatrix.classify(result),) if status == ResultMatrix.OK]
+
+    def average(self):
+        values = self.complete_values()
+        return round(sum(values) / len(values), 1) if values else None
+
+    def statistics(self):
+        counts = {ResultMatrix.OK: 0, ResultMatrix.MISSING: 0, ResultMatrix.FAILED: 0, ResultMatrix.ONGOING: 0}
+        values = []
+        for _, _, result in self.cells():
+            status, value = ResultMatrix.classify(result)
+            counts[status] += 1
+            if status == ResultMatrix.OK:
+                values.append(value)
+        # Cells with no stored result are missing as well
+        cells = len(self.algorithms) * len(self.datasets)
+        return {
+            'algorithms': len(self.algorithms),
+            'datasets': len(self.datasets),
+            'complete': counts[ResultMatrix.OK],
+            'failed': counts[ResultMatrix.FAILED],
+            'ongoing': counts[ResultMatrix.ONGOING],
+            'missing': cells - counts[ResultMatrix.OK] - counts[ResultMatrix.FAILED] - counts[ResultMatrix.ONGOING],
+            'average': round(sum(values) / len(values), 1) if values else None,
+            'minimum': min(values, default=None),
+            'maximum': max(values, default=None),
+        }
+
+def parse_dataset_line(line):
+    data = line.strip().split(', ')
+    dataset_id, name, weight, size, source = data
+    if not (dataset_id.startswith('D') and dataset_id[-1] in ('S', 'A') and len(dataset_id[1:-1]) == 2 and dataset_id[1:-1].isdigit()):
+        raise InvalidDatasetIDError(f"Invalid dataset ID: {dataset_id}")
+    return Dataset(dataset_id, name, int(weight), int(size), source)
+
+def parse_algorithm_line(line):
+    data = line.strip().split(', ')
+    name, category, year, *authors = data
+    return Algorithm(name, category, int(year), authors)
+
+def tokenize_result_line(line):
+    # Returns the algorithm name and its validated (dataset_id, result_value) cells without resolving either
+    data = line.strip().split(', ')
+    algorithm_name = data[0]
+    results = data[1:]
+    if not results:
+        raise FileFormatError("Result file is empty.")
+    cells = []
+    for result in results:
+        dataset_id, result_value = result.split(': ')
+        if dataset_id == '404':
+            result_value = '--'
+        elif not result_value.replace('.', '', 1).isdigit():
+            raise InvalidResultError(f"Invalid result value: {result_value}")
+        cells.append((dataset_id, result_value))
+    return algorithm_name, cells
+
+def parse_result_lines(lines, algorithm_index, dataset_index):
+    for line in lines:
+        algorithm_name, cells = tokenize_result_line(line)
+        algorithm = algorithm_index.get(algorithm_name)
+        if algorithm is None:
+            continue
+        for dataset_id, result_value in cells:
+            dataset = dataset_index.get(dataset_id)
+            if dataset is not None:
+                yield algorithm, dataset, result_value
+
+def parse_file_lines(file_name, parse_line):
+    # Collect-all parsing used by the async loader: returns the parsed lines and one message per bad line
+    parsed = []
+    errors = []
+    with open(file_name, 'r') as file:
+        for line_number, line in enumerate(file, 1):
+            try:
+                parsed.append(parse_line(line))
+            except (FileFormatError, InvalidDatasetIDError, InvalidResultError, ValueError) as e:
+                errors.append(f"{file_name}:{line_number}: {e}")
+    return parsed, errors
+
+NUMBER_PATTERN = re.compile(r'\d+\.?\d*|\.\d+')
+DATASET_ID_PATTERN = re.compile(r'D\d\d[SA]')
+INTEGER_PATTERN = re.compile(r'[+-]?\d+')
+# Whole-line patterns that only accept lines the per-line checks would accept, so a batch in which every
+# line matches needs no further work
+VALID_LINE_PATTERNS = {
+    'datasets': r'D\d\d[SA], [^,\n]*, \d+, \d+, [^,\n]*',
+    'algorithms': r'[^,\n]+, [^,\n]*, \d+(?:, [^,\n]*)*',
+    'results': r'[^,\n]*(?:, (?:404: [^,:\n]*|[^,:\n]*: (?:\d+\.?\d*|\.\d+)))+',
+}
+# Lines with surrounding whitespace are left to the per-line checks since the parsers strip them first
+VALID_LINE_PATTERNS = {kind: re.compile(rf'^(?!\s){pattern}(?<!\s)$', re.MULTILINE) for kind, pattern in VALID_LINE_PATTERNS.items()}
+
+class ValidationIssue:
+    def __init__(self, file_name, line, column, message):
+        self.file_name = file_name
+        self.line = line
+        self.column = column
+        self.message = message
+
+    def __str__(self):
+        return f"{self.file_name}:{self.line}:{self.column}: {self.message}"
+
+class ValidationReport:
+    def __init__(self):
+        self.issues = []
+        self.lines_checked = 0
+
+    @property
+    def ok(self):
+        return not self.issues
+
+    def to_dict(self):
+        return {'lines_checked': self.lines_checked,
+                'issues': [{'file': issue.file_name, 'line': issue.line, 'column': issue.column, 'message': issue.message} for issue in self.issues]}
+
+    def __str__(self):
+        if self.ok:
+            return f"No problems found in {self.lines_checked} lines."
+        return "\n".join(str(issue) for issue in self.issues)
+
+def field_columns(line, separator):
+    # 1-based column where each separated field starts
+    columns = []
+    column = 1
+    for field in line.split(separator):
+        columns.append(column)
+        column += len(field) + len(separator)
+    return columns
+
+def check_dataset_line(line):
+    fields = line.strip().split(', ')
+    if len(fields) != 5:
+        return 1, f"Expected 5 fields, found {len(fields)}"
+    columns = field_columns(line, ', ')
+    if not DATASET_ID_PATTERN.fullmatch(fields[0]):
+        return columns[0], f"Invalid dataset ID: {fields[0]}"
+    for index in (2, 3):
+        if not INTEGER_PATTERN.fullmatch(fields[index].strip()):
+            return columns[index], f"Invalid integer: {fields[index]}"
+    return None
+
+def check_algorithm_line(line):
+    fields = line.strip().split(', ')
+    if len(fields) < 3:
+        return 1, f"Expected at least 3 fields, found {len(fields)}"
+    if not INTEGER_PATTERN.fullmatch(fields[2].strip()):
+        return field_columns(line, ', ')[2], f"Invalid year: {fields[2]}"
+    return None
+
+def check_result_line(line):
+    fields = line.strip().split(', ')
+    if len(fields) < 2:
+        return 1, "Result file is empty."
+    for column, cell in list(zip(field_columns(line, ', '), fields))[1:]:
+        parts = cell.split(': ')
+        if len(parts) != 2:
+            return column, f"Expected '<dataset_id>: <result>', found: {cell}"
+        dataset_id, result_value = parts
+        if dataset_id != '404' and not NUMBER_PATTERN.fullmatch(result_value):
+            return column + len(dataset_id) + 2, f"Invalid result value: {result_value}"
+    return None
+
+LINE_CHECKS = {'datasets': check_dataset_line, 'algorithms': check_algorithm_line, 'results': check_result_line}
+
+def validate_file(file_name, kind, report=None, fail_fast=False, batch_size=10000):
+    report = report if report is not None else ValidationReport()
+    valid_line = VALID_LINE_PATTERNS[kind]
+    check_line = LINE_CHECKS[kind]
+    try:
+        with open(file_name, 'r') as file:
+            first_line = 1
+            while True:
+                lines = file.readlines(batch_size * 64)
+                if not lines:
+                    break
+                report.lines_checked += len(lines)
+                # One regex scan clears the whole batch unless some line needs a closer look
+                if len(valid_line.findall("".join(lines))) != len(lines):
+                    for offset, line in enumerate(lines):
+                        problem = check_line(line.rstrip('\n'))
+                        if problem is not None:
+                            report.issues.append(ValidationIssue(file_name, first_line + offset, *problem))
+                            if fail_fast:
+                                return report
+                first_line += len(lines)
+    except OSError as e:
+        report.issues.append(ValidationIssue(file_name, 0, 0, f"Cannot read file: {e.strerror}"))
+    return report
+
+def split_file_ranges(file_name, chunks):
+    # Byte offsets [start, end) that each begin at the start of a line
+    size = os.path.getsize(file_name)
+    offsets = [0]
+    with open(file_name, 'rb') as file:
+        for k in range(1, chunks):
+            file.seek(max(size * k // chunks, offsets[-1]))
+            file.readline()
+            offsets.append(min(file.tell(), size))
+    offsets.append(size)
+    return [(start, end) for start, end in zip(offsets, offsets[1:]) if start < end]
+
+_chunk_algorithm_index = None
+_chunk_dataset_index = None
+
+def _init_chunk_worker(algorithm_names, dataset_ids):
+    global _chunk_algorithm_index, _chunk_dataset_index
+    _chunk_algorithm_index = {name: i for i, name in enumerate(algorithm_names)}
+    _chunk_dataset_index = {dataset_id: j for j, dataset_id in enumerate(dataset_ids)}
+
+def _read_line_range(file_name, start, end):
+    with open(file_name, 'rb') as file:
+        file.seek(start)
+        while file.tell() < end:
+            line = file.readline()
+            if not line:
+                break
+            yield line.decode()
+
+def parse_result_columns(lines, algorithm_index, dataset_index):
+    # Returns row, col and value-id columns plus the table of distinct values, as stored in a snapshot
+    rows = array('i')
+    cols = array('i')
+    value_ids = array('i')
+    value_table = {}
+    try:
+        for row, col, result_value in parse_result_lines(lines, algorithm_index, dataset_index):
+            rows.append(row)
+            cols.append(col)
+            value_ids.append(value_table.setdefault(result_value, len(value_table)))
+    except (FileFormatError, InvalidResultError) as e:
+        return rows, cols, value_ids, list(value_table), e
+    return rows, cols, value_ids, list(value_table), None
+
+def _parse_result_chunk(file_name, start, end):
+    return parse_result_columns(_read_line_range(file_name, start, end), _chunk_algorithm_index, _chunk_dataset_index)
+
+def split_index_ranges(count, shards):
+    # Contiguous [start, end) index ranges of nearly equal size
+    return [(count * k // shards, count * (k + 1) // shards) for k in range(shards) if count * k // shards < count * (k + 1) // shards]
+
+def numpy_int_column(np):
+    # column argument of result_entries that builds int32 NumPy arrays
+    return lambda items, count: np.fromiter(items, dtype=np.int32, count=count)
+
+def shared_entry_columns(buffer, count, table_size):
+    # Fill block layout: the number and the status of every distinct value, then the row, col and value-id columns
+    # of the entries, as (numbers, rows, cols, value_ids, statuses) views of buffer
+    numbers_end = 8 * table_size
+    return (buffer[:numbers_end].cast('d'), buffer[numbers_end:numbers_end + 4 * count].cast('i'),
+            buffer[numbers_end + 4 * count:numbers_end + 8 * count].cast('i'), buffer[numbers_end + 8 * count:numbers_end + 12 * count].cast('i'),
+            buffer[numbers_end + 12 * count:numbers_end + 12 * count + table_size].cast('b'))
+
+def release_shared_blocks(blocks):
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+class SharedResultGrid:
+    # The value and status grids of compute_statistics_parallel, laid out like ResultMatrix.values/status but in
+    # shared memory. They are filled once by the worker pool and read by every later parallel pass until Records drops
+    # them with its matrix; the blocks are unlinked when the grid is garbage collected.
+    def __init__(self, algorithms, datasets):
+        import weakref
+        from multiprocessing import shared_memory
+        self.algorithms = algorithms
+        self.datasets = datasets
+        self.ncols = len(datasets)
+        cells = len(algorithms) * self.ncols
+        self.values_block = shared_memory.SharedMemory(create=True, size=max(1, 8 * cells))
+        self.status_block = shared_memory.SharedMemory(create=True, size=max(1, cells))
+        # New blocks are zeroed, which is already the 0.0 of every cell that is not OK
+        self.status_block.buf[:cells] = bytes([ResultMatrix.MISSING]) * cells
+        self.filled = False
+        # Number of stored entries that are 'XX', '' or '--', kept for Algorithm.ongoing_results
+        self.stored_incomplete = 0
+        weakref.finalize(self, release_shared_blocks, (self.values_block, self.status_block))
+
+    def entries_block(self, results):
+        # Copies the entry columns of results and the classified distinct values into a new block for the fill shards.
+        # Snapshot and parallel-read columns are copied as they are; returns (block, entry count, table size).
+        from multiprocessing import shared_memory
+        np = optional_numpy()
+        rows, cols, value_ids, value_table = result_entries(self.algorithms, self.datasets, results, int_column if np is None else numpy_int_column(np))
+        classified = [ResultMatrix.classify(result) for result in value_table]
+        count = len(rows)
+        block = shared_memory.SharedMemory(create=True, size=max(1, 8 * len(value_table) + 12 * count + len(value_table)))
+        columns = (array('d', [0.0 if number is None else number for _, number in classified]), rows, cols, value_ids, array('b', [status for status, _ in classified]))
+        for view, column in zip(shared_entry_columns(block.buf, count, len(value_table)), columns):
+            view[:] = memoryview(column).cast('B').cast(view.format)
+            view.release()
+        return block, count, len(value_table)
+
+_shared_blocks = None
+_shared_values = None
+_shared_status = None
+_shared_rows = 0
+_shared_columns = 0
+_shared_entries = None
+_shared_numpy = None
+
+def _init_statistics_worker(values_name, status_name, rows, columns, entries_name=None, entry_count=0, table_size=0):
+    # Attaches to the shared grid, and to the entries of a pending fill, once per worker; the blocks stay open for the
+    # life of the process. With NumPy installed the shards work on arrays over the same memory.
+    global _shared_blocks, _shared_values, _shared_status, _shared_rows, _shared_columns, _shared_entries, _shared_numpy
+    from multiprocessing import shared_memory
+    _shared_blocks = [shared_memory.SharedMemory(values_name), shared_memory.SharedMemory(status_name)]
+    _shared_values = _shared_blocks[0].buf[:8 * rows * columns].cast('d')
+    _shared_status = _shared_blocks[1].buf[:rows * columns].cast('b')
+    _shared_rows = rows
+    _shared_columns = columns
+    if entries_name is not None:
+        _shared_blocks.append(shared_memory.SharedMemory(entries_name))
+        _shared_entries = shared_entry_columns(_shared_blocks[2].buf, entry_count, table_size)
+    _shared_numpy = np = optional_numpy()
+    if np is not None:
+        _shared_values = np.frombuffer(_shared_values, dtype=np.float64)
+        _shared_status = np.frombuffer(_shared_status, dtype=np.int8)
+        if _shared_entries is not None:
+            _shared_entries = tuple(np.frombuffer(column, dtype=dtype) for column, dtype in zip(_shared_entries, (np.float64, np.int32, np.int32, np.int32, np.int8)))
+
+def _fill_grid_shard(start, end):
+    # Writes entries start..end-1 into the shared grid, as ResultMatrix.__init__ does, and returns how many of them
+    # are 'XX', '' or '--'. The entries hold no repeated cell, so shards never write the same cell.
+    numbers, rows, cols, value_ids, statuses = _shared_entries
+    np = _shared_numpy
+    if np is not None:
+        ids = value_ids[start:end]
+        index = rows[start:end].astype(np.int64) * _shared_columns + cols[start:end]
+        entry_status = statuses[ids]
+        _shared_status[index] = entry_status
+        _shared_values[index] = numbers[ids]
+        return int(np.count_nonzero((entry_status == ResultMatrix.MISSING) | (entry_status == ResultMatrix.ONGOING)))
+    incomplete = 0
+    for row, col, value_id in zip(rows[start:end], cols[start:end], value_ids[start:end]):
+        index = row * _shared_columns + col
+        status = statuses[value_id]
+        _shared_status[index] = status
+        if status == ResultMatrix.OK:
+            _shared_values[index] = numbers[value_id]
+        elif status != ResultMatrix.FAILED:
+            incomplete += 1
+    return incomplete
+
+def _dataset_statistics_shard(start, end):
+    # Same arithmetic as ResultMatrix.compute_dataset_statistics, for columns start..end-1
+    np = _shared_numpy
+    if np is not None:
+        values = _shared_values.reshape(_shared_rows, _shared_columns)[:, start:end]
+        status = _shared_status.reshape(_shared_rows, _shared_columns)[:, start:end]
+        return numpy_dataset_statistics(np, values, status, start)
+    statistics = []
+    for j in range(start, end):
+        values = _shared_values[j::_shared_columns].tolist()
+        status = _shared_status[j::_shared_columns].tolist()
+        count = status.count(ResultMatrix.OK)
+        nfail = status.count(ResultMatrix.MISSING) + status.count(ResultMatrix.FAILED)
+        if count:
+            complete_results = list(compress(values, [code == ResultMatrix.OK for code in status]))
+            statistics.append((j, nfail, round(sum(values) / count, 1), f"{round(min(complete_results), 1)} - {round(max(complete_results), 1)}"))
+        else:
+            statistics.append((j, nfail, '-', '-'))
+    return statistics
+
+def _algorithm_statistics_shard(start, end, weights):
+    # Same arithmetic as ResultMatrix.compute_algorithm_statistics and compute_scores, for rows start..end-1
+    np = _shared_numpy
+    if np is not None:
+        values = _shared_values[start * _shared_columns:end * _shared_columns].reshape(end - start, _shared_columns)
+        status = _shared_status[start * _shared_columns:end * _shared_columns].reshape(end - start, _shared_columns)
+        scores = numpy_top_rank_scores(np, values, status, weights) if weights is not None else repeat(None)
+        return [(i, fail_columns, average, score) for (i, fail_columns, average), score in zip(numpy_algorithm_statistics(np, values, status, start), scores)]
+    statistics = []
+    for i in range(start, end):
+        values = _shared_values[i * _shared_columns:(i + 1) * _shared_columns].tolist()
+        status = _shared_status[i * _shared_columns:(i + 1) * _shared_columns].tolist()
+        count = status.count(ResultMatrix.OK)
+        fail_columns = [j for j, code in enumerate(status) if code == ResultMatrix.FAILED]
+        average = round(sum(values) / count, 1) if count else None
+        score = top_rank_score(compress(values, [code == ResultMatrix.OK for code in status]), weights) if weights is not None else None
+        statistics.append((i, fail_columns, average, score))
+    return statistics
+
+MERGE_POLICIES = ('last', 'best', 'complete')
+
+def merge_result(policy, old_value, new_value):
+    # Whether a cell that two shards report keeps old_value (True) or takes new_value (False). A flag rather than
+    # the chosen value, since equal values (interned or not) cannot tell which side won.
+    if policy == 'last':
+        return False
+    old_status, old_number = ResultMatrix.classify(old_value)
+    new_status, new_number = ResultMatrix.classify(new_value)
+    if policy == 'best':
+        return old_status == ResultMatrix.OK and (new_status != ResultMatrix.OK or new_number < old_number)
+    # 'complete': a finished result (a value or a 404) is never replaced by an ongoing or missing one
+    return old_status in (ResultMatrix.OK, ResultMatrix.FAILED) and new_status in (ResultMatrix.ONGOING, ResultMatrix.MISSING)
+
+# Every finite float is a whole multiple of 2 ** -1074, so sums kept in those units are exact
+EXACT_SCALE = 1 << 1074
+
+def exact_units(value):
+    numerator, denominator = value.as_integer_ratio()
+    return numerator * (EXACT_SCALE // denominator)
+
+class RunningStatistics:
+    # Count, exact sum, extremes and Welford mean/M2 over complete results, plus failure and ongoing counts
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+        # How many of the values equal the minimum/maximum, so removing one of several tied extremes needs no rebuild
+        self.minimum_count = 0
+        self.maximum_count = 0
+        self.nfail = 0
+        self.ongoing = 0
+
+    def add(self, status, value):
+        if status == ResultMatrix.OK:
+            self.count += 1
+            self.total += exact_units(value)
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (value - self.mean)
+            if self.minimum is None or value < self.minimum:
+                self.minimum = value
+                self.minimum_count = 1
+            elif value == self.minimum:
+                self.minimum_count += 1
+            if self.maximum is None or value > self.maximum:
+                self.maximum = value
+                self.maximum_count = 1
+            elif value == self.maximum:
+                self.maximum_count += 1
+        elif status == ResultMatrix.FAILED:
+            self.nfail += 1
+        elif status == ResultMatrix.ONGOING:
+            self.ongoing += 1
+
+    def remove(self, status, value):
+        # Returns True when minimum/maximum have to be rebuilt with reset_extremes
+        if status == ResultMatrix.OK:
+            self.count -= 1
+            if self.count == 0:
+                self.total = 0
+                self.mean = self.m2 = 0.0
+                self.minimum = self.maximum = None
+                self.minimum_count = self.maximum_count = 0
+                return False
+            self.total -= exact_units(value)
+            delta = value - self.mean
+            self.mean -= delta / self.count
+            self.m2 -= delta * (value - self.mean)
+            if value == self.minimum:
+                self.minimum_count -= 1
+            if value == self.maximum:
+                self.maximum_count -= 1
+            return self.minimum_count == 0 or self.maximum_count == 0
+        if status == ResultMatrix.FAILED:
+            self.nfail -= 1
+        elif status == ResultMatrix.ONGOING:
+            self.ongoing -= 1
+        return False
+
+    def reset_extremes(self, values):
+        values = list(values)
+        self.minimum = min(values, default=None)
+        self.maximum = max(values, default=None)
+        self.minimum_count = values.count(self.minimum)
+        self.maximum_count = values.count(self.maximum)
+
+    def rounded_average(self, grid_values):
+        # round(sum / count, 1) as a full pass summing the values in grid order gets it. The exact mean settles the
+        # rounding unless it lies so close to a .x5 boundary that the float error of that sum could cross it; only then
+        # are the values fetched again with grid_values() and summed like the full pass does.
+        denominator = self.count * EXACT_SCALE
+        remainder = 10 * self.total % denominator
+        boundary_distance = abs(2 * remainder - denominator) / denominator / 20
+        # A sequential sum of count floats is off by at most about count ulps of the largest magnitude
+        largest = max(abs(self.minimum), abs(self.maximum))
+        if boundary_distance > (self.count + 2) * 2 ** -52 * largest:
+            return round(self.total / denominator, 1)
+        return round(sum(grid_values()) / self.count, 1)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+SKETCH_SIZE = 200
+
+class QuantileSketch:
+    # KLL quantile sketch over complete results. Levels hold values of weight 1, 2, 4, ...; a full level is sorted and
+    # every other value (from a random offset) is promoted to the next one, so memory stays around 3 * k values.
+    # Estimated quantiles are off by at most about 1.7 / k of the count in rank with high probability (under 1% at
+    # k = 200) and are exact while no more than k values have been added. Sketches with the same k can be merged.
+    def __init__(self, k=SKETCH_SIZE, seed=0):
+        self.k = k
+        self.random = random.Random(seed)
+        self.levels = [[]]
+        self.count = 0
+        self.minimum = None
+        self.maximum = None
+        self.max_size = self.capacity(0)
+
+    def capacity(self, height):
+        depth = len(self.levels) - height - 1
+        return int(math.ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def add(self, value):
+        self.levels[0].append(value)
+        self.count += 1
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        if len(self.levels[0]) >= self.capacity(0):
+            self.compress()
+
+    def size(self):
+        return sum(len(level) for level in self.levels)
+
+    def compress(self):
+        while self.size() >= self.max_size:
+            for height, level in enumerate(self.levels):
+                if len(level) >= self.capacity(height):
+                    if height + 1 == len(self.levels):
+                        self.levels.append([])
+                        self.max_size = sum(self.capacity(h) for h in range(len(self.levels)))
+                    level.sort()
+                    # With an odd number of values the largest one stays behind so the total weight is unchanged
+                    kept = [level.pop()] if len(level) % 2 else []
+                    self.levels[height + 1].extend(level[self.random.getrandbits(1)::2])
+                    self.levels[height] = kept
+                    break
+            else:
+                break
+
+    def merge(self, other):
+        if other.k != self.k:
+            raise ValueError(f"Cannot merge sketches of size {self.k} and {other.k}")
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, values in zip(self.levels, other.levels):
+            level.extend(values)
+        self.count += other.count
+        for value in (other.minimum, other.maximum):
+            if value is not None:
+                self.minimum = value if self.minimum is None else min(self.minimum, value)
+                self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.max_size = sum(self.capacity(h) for h in range(len(self.levels)))
+        self.compress()
+
+    def weighted_values(self):
+        return sorted((value, 1 << height) for height, level in enumerate(self.levels) for value in level)
+
+    def quantiles(self, fractions):
+        # Nearest-rank quantiles: the smallest value whose cumulative weight reaches fraction * count
+        if not self.count:
+            return [None] * len(fractions)
+        weighted_values = self.weighted_values()
+        total = sum(weight for _, weight in weighted_values)
+        estimates = []
+        for fraction in fractions:
+            if fraction <= 0:
+                estimates.append(self.minimum)
+                continue
+            if fraction >= 1:
+                estimates.append(self.maximum)
+                continue
+            target = fraction * total
+            cumulative = 0
+            for value, weight in weighted_values:
+                cumulative += weight
+                if cumulative >= target:
+                    estimates.append(value)
+                    break
+        return estimates
+
+    def quantile(self, fraction):
+        return self.quantiles([fraction])[0]
+
+    def histogram(self, bins=10):
+        # (low, high, estimated count) for equal-width bins between the exact minimum and maximum
+        if not self.count:
+            return []
+        width = (self.maximum - self.minimum) / bins or 1
+        counts = [0] * bins
+        for value, weight in self.weighted_values():
+            counts[min(bins - 1, int((value - self.minimum) / width))] += weight
+        return [(self.minimum + i * width, self.minimum + (i + 1) * width, count) for i, count in enumerate(counts)]
+
+class StatisticsCache:
+    # Which derived statistics are current. Each aspect is None when everything is stale, otherwise the set of
+    # entities touched by mutations since it was last computed. Derived views are memoized in a bounded LRU.
+    ASPECTS = ('datasets', 'algorithms', 'scores')
+
+    def __init__(self, max_views=64):
+        self.max_views = max_views
+        self.views = OrderedDict()
+        self.invalidate()
+
+    def invalidate(self):
+        self.stale = dict.fromkeys(self.ASPECTS)
+        self.score_weights = None
+        # Stored 'XX', '' and '--' results, i.e. Algorithm.ongoing_results, or None when unknown
+        self.stored_incomplete = None
+        self.views.clear()
+
+    def mark(self, aspect, entities=None):
+        stale = self.stale[aspect]
+        if entities is None:
+            self.stale[aspect] = None
+        elif stale is not None:
+            stale.update(entities)
+        self.views.clear()
+
+    def expand(self, aspect, entities):
+        # Swaps an all-stale marker for the explicit entities, for stores where per-entity passes are cheap
+        if self.stale[aspect] is None:
+            self.stale[aspect] = set(entities)
+
+    def clean(self, aspect):
+        if self.stale[aspect] != set():
+            self.views.clear()
+        self.stale[aspect] = set()
+
+    def view(self, key, build):
+        if key in self.views:
+            self.views.move_to_end(key)
+            return self.views[key]
+        value = self.views[key] = build()
+        if len(self.views) > self.max_views:
+            self.views.popitem(last=False)
+        return value
+
+SNAPSHOT_MAGIC = b'RECSNAP1'
+# magic, input fingerprint, length of the JSON entity block, number of results
+SNAPSHOT_HEADER = struct.Struct('<8s32sQQ')
+
+def input_fingerprint(file_names):
+    digest = hashlib.sha256()
+    for file_name in file_names:
+        stat = os.stat(file_name)
+        digest.update(struct.pack('<QQ', stat.st_size, stat.st_mtime_ns))
+        with open(file_name, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b''):
+                digest.update(block)
+    return digest.digest()
+
+class ReportWriter:
+    FORMATS = ('text', 'csv', 'json', 'ndjson')
+
+    def __init__(self, sink=None, report_format='text', mode='a', batch_size=1000):
+        if report_format not in self.FORMATS:
+            raise ValueError(f"Unknown report format: {report_format}")
+        self.report_format = report_format
+        self.batch_size = batch_size
+        self.owns_sink = isinstance(sink, str)
+        self.sink = open(sink, mode) if self.owns_sink else (sink or sys.stdout)
+        self.buffer = []
+        self.table_count = 0
+        if report_format == 'json':
+            self.buffer.append('[')
+        elif report_format == 'csv':
+            import csv
+            self.csv_writer = csv.writer(self, lineterminator='\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, line):
+        self.buffer.append(line)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        self.sink.writelines(self.buffer)
+        self.buffer.clear()
+
+    def write_text(self, text):
+        # Free-form lines such as titles and summaries only belong in the text report
+        if self.report_format == 'text':
+            self.write(text)
+
+    def write_table(self, title, header, columns, rows, text_row):
+        # rows are tuples matching columns; text_row renders one of them as a text report line without the newline
+        if self.report_format == 'text':
+            self.write(f"{title}\n{header}\n")
+            for row in rows:
+                self.write(f"{text_row(row)}\n")
+        elif self.report_format == 'csv':
+            self.csv_writer.writerow(['Table', *columns])
+            for row in rows:
+                self.csv_writer.writerow([title, *row])
+        elif self.report_format == 'ndjson':
+            for row in rows:
+                self.write(json.dumps({'table': title, **dict(zip(columns, row))}) + '\n')
+        else:
+            self.write(f"{',' if self.table_count else ''}\n{{\"title\": {json.dumps(title)}, \"columns\": {json.dumps(columns)}, \"rows\": [")
+            for i, row in enumerate(rows):
+                self.write(f"{',' if i else ''}\n{json.dumps(list(row))}")
+            self.write("]}")
+        self.table_count += 1
+
+    def close(self):
+        if self.report_format == 'json':
+            self.buffer.append('\n]\n')
+        self.flush()
+        if self.owns_sink:
+            self.sink.close()
+        else:
+            self.sink.flush()
+
+QUANTILES = (0.5, 0.9, 0.99)
+QUANTILE_COLUMNS = ['Median', 'P90', 'P99']
+DATASET_COLUMNS = ['DatasetID', 'Name', 'Type', 'Weight', 'Ndata', 'Source', 'Average', 'Range', 'Nfail']
+ALGORITHM_COLUMNS = ['Name', 'Category', 'Year', 'Authors']
+ALGORITHM_INFORMATION_COLUMNS = ALGORITHM_COLUMNS + ['Average', 'Nfail', 'FailDatasets', 'Nongoing', 'Score']
+
+def dataset_row(dataset):
+    return (dataset.dataset_id, dataset.name, dataset.type, dataset.weight, dataset.size, dataset.source, dataset.average, dataset.range, dataset.nfail)
+
+def algorithm_row(algorithm):
+    return (algorithm.name, algorithm.category, algorithm.year, '-'.join(algorithm.authors))
+
+def dataset_text_row(row):
+    return f"| {' '.join(map(str, row))} |"
+
+def algorithm_text_row(row):
+    name, category, year, authors_str = row
+    return f"| {name:<12} {category:<4} {year:<4} {authors_str:<20} |"
+
+class PhaseMetrics:
+    # Wall time, CPU time, net allocated blocks and item counts per Records phase, plus optional cProfile/tracemalloc capture
+    def __init__(self, profile=False, trace_memory=False):
+        self.phases = {}
+        self.profiler = None
+        self.tracemalloc = None
+        if profile:
+            import cProfile
+            self.profiler = cProfile.Profile()
+        if trace_memory:
+            import tracemalloc
+            self.tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    def record(self, phase, method, records, args, kwargs, items):
+        if self.tracemalloc is not None:
+            self.tracemalloc.reset_peak()
+        blocks = sys.getallocatedblocks()
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.enable()
+        try:
+            return method(records, *args, **kwargs)
+        finally:
+            if self.profiler is not None:
+                self.profiler.disable()
+            stats = self.phases.setdefault(phase, {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'allocated_blocks': 0, 'items': 0})
+            stats['calls'] += 1
+            stats['wall_seconds'] += time.perf_counter() - wall
+            stats['cpu_seconds'] += time.process_time() - cpu
+            stats['allocated_blocks'] += sys.getallocatedblocks() - blocks
+            stats['items'] = items(records) if items else 0
+            if self.tracemalloc is not None:
+                stats['peak_bytes'] = max(stats.get('peak_bytes', 0), self.tracemalloc.get_traced_memory()[1])
+
+    def to_dict(self):
+        return {'phases': self.phases}
+
+    def dump_json(self, file_name):
+        with open(file_name, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def dump_profile(self, file_name):
+        if self.profiler is not None:
+            import pstats
+            pstats.Stats(self.profiler).dump_stats(file_name)
+
+def instrumented(phase, items=None):
+    # With metrics disabled the wrapper costs one attribute check per phase call
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.metrics is None:
+                return method(self, *args, **kwargs)
+            return self.metrics.record(phase, method, self, args, kwargs, items)
+        return wrapper
+    return decorate
+
+def count_datasets(records):
+    return len(records.datasets)
+
+def count_algorithms(records):
+    return len(records.algorithms)
+
+def count_results(records):
+    return len(records.results)
+
+class Records:
+    def __init__(self, columnar=False, compact=False, sparse=False, max_cached_views=64, sketches=False, workers=None):
         self.datasets = []
         self.algorithms = []
-        self.results = {}
+        self.results = SparseResults() if sparse else PackedResults() if compact else {}
+        self.sparse = sparse
+        self.dataset_index = {}
+        self.algorithm_index = {}
+        self.dataset_attribute_index = EntityIndex({'type': lambda dataset: (dataset.type,), 'source': lambda dataset: (dataset.source,),
+                                                    'weight': lambda dataset: (dataset.weight,)}, ranged=('weight',))
+        self.algorithm_attribute_index = EntityIndex({'category': lambda algorithm: (algorithm.category,), 'year': lambda algorithm: (algorithm.year,),
+                                                      'author': lambda algorithm: set(algorithm.authors)}, ranged=('year',))
+        self.columnar = columnar
+        # With sketches on, the information reports gain Median/P90/P99 columns from per-entity QuantileSketches
+        self.sketches = sketches
+        self.dataset_sketches = None
+        self.algorithm_sketches = None
+        # More than one worker computes full statistics passes in a process pool, see compute_statistics_parallel
+        self.workers = workers
+        self.matrix = None
+        # Running aggregates per entity, built on the first add_result/update_result call
+        self.dataset_statistics = None
+        self.algorithm_statistics = None
+        # Results written straight into self.results must be followed by clear_caches()
+        self.statistics_cache = StatisticsCache(max_cached_views)
+        self.metrics = None
         self.report_time = datetime.datetime.now().strftime("%d/%m/%Y %H:%M:%S")
 
+    def enable_metrics(self, profile=False, trace_memory=False):
+        self.metrics = PhaseMetrics(profile, trace_memory)
+        return self.metrics
+
     def add_dataset(self, dataset):
+        if dataset.dataset_id in self.dataset_index:
+            raise DuplicateEntryError(f"Duplicate dataset ID: {dataset.dataset_id}")
+        self.dataset_index[dataset.dataset_id] = dataset
         self.datasets.append(dataset)
+        self.dataset_attribute_index.add(dataset)
+        self.matrix = None
+        # Every row gained a missing result, which only the new dataset's statistics count
+        self.statistics_cache.mark('datasets', (dataset,))
+        if self.dataset_sketches is not None:
+            self.dataset_sketches[dataset] = QuantileSketch()
+        if self.dataset_statistics is not None:
+            self.dataset_statistics[dataset] = RunningStatistics()
+            self.refresh_dataset(dataset)
 
     def add_algorithm(self, algorithm):
+        if algorithm.name in self.algorithm_index:
+            raise DuplicateEntryError(f"Duplicate algorithm name: {algorithm.name}")
+        self.algorithm_index[algorithm.name] = algorithm
         self.algorithms.append(algorithm)
+        self.algorithm_attribute_index.add(algorithm)
+        self.matrix = None
+        # Every dataset gained a missing result
+        self.statistics_cache.mark('datasets')
+        self.statistics_cache.mark('algorithms', (algorithm,))
+        self.statistics_cache.mark('scores', (algorithm,))
+        if self.algorithm_sketches is not None:
+            self.algorithm_sketches[algorithm] = QuantileSketch()
+        if self.algorithm_statistics is not None:
+            self.algorithm_statistics[algorithm] = RunningStatistics()
+            self.refresh_algorithm(algorithm)
+            # Every dataset gained a missing result
+            for dataset in self.datasets:
+                self.refresh_dataset(dataset)
+
+    def get_dataset(self, dataset_id):
+        return self.dataset_index.get(dataset_id)
+
+    def get_algorithm(self, name):
+        return self.algorithm_index.get(name)
+
+    def clear_caches(self):
+        self.matrix = None
+        self.dataset_statistics = None
+        self.algorithm_statistics = None
+        self.dataset_sketches = None
+        self.algorithm_sketches = None
+        self.statistics_cache.invalidate()
+
+    def track_statistics(self):
+        if self.dataset_statistics is not None:
+            return
+        self.dataset_statistics = {dataset: RunningStatistics() for dataset in self.datasets}
+        self.algorithm_statistics = {algorithm: RunningStatistics() for algorithm in self.algorithms}
+        for algorithm in self.algorithms:
+            algorithm.fail_datasets = []
+        for (algorithm, dataset), result_value in self.results.items():
+            self.accumulate_result(algorithm, dataset, ResultMatrix.classify(result_value), 1)
+        for dataset in self.datasets:
+            self.refresh_dataset(dataset)
+        for algorithm in self.algorithms:
+            self.refresh_algorithm(algorithm)
+        # The running aggregates just overwrote every entity's statistics, in their own order for fail_datasets
+        self.statistics_cache.mark('datasets')
+        self.statistics_cache.mark('algorithms')
+
+    def accumulate_result(self, algorithm, dataset, classified, sign):
+        status, value = classified
+        dataset_stats = self.dataset_statistics[dataset]
+        algorithm_stats = self.algorithm_statistics[algorithm]
+        if sign > 0:
+            dataset_stats.add(status, value)
+            algorithm_stats.add(status, value)
+            if status == ResultMatrix.FAILED:
+                algorithm.fail_datasets.append(f"{dataset.dataset_id} (404)")
+            return
+        if dataset_stats.remove(status, value):
+            dataset_stats.reset_extremes(self.complete_column(dataset))
+        if algorithm_stats.remove(status, value):
+            algorithm_stats.reset_extremes(self.complete_row(algorithm))
+        if status == ResultMatrix.FAILED:
+            algorithm.fail_datasets.remove(f"{dataset.dataset_id} (404)")
+
+    @staticmethod
+    def complete_values(results):
+        for result in results:
+            status, value = ResultMatrix.classify(result)
+            if status == ResultMatrix.OK:
+                yield value
+
+    def complete_column(self, dataset):
+        # Complete results of one dataset in algorithm order, the order the full passes add them up in
+        if self.sparse:
+            return list(self.complete_values(result for _, result in self.results.column_items(dataset, self.algorithm_attribute_index.positions)))
+        return list(self.complete_values(self.results.get((algorithm, dataset)) for algorithm in self.algorithms))
+
+    def complete_row(self, algorithm):
+        if self.sparse:
+            return list(self.complete_values(result for _, result in self.results.row_items(algorithm, self.dataset_attribute_index.positions)))
+        return list(self.complete_values(self.results.get((algorithm, dataset)) for dataset in self.datasets))
+
+    def refresh_dataset(self, dataset):
+        stats = self.dataset_statistics[dataset]
+        # Absent, 'XX' and '' results all count as missing, so nfail is everything that is neither complete nor ongoing
+        dataset.nfail = len(self.algorithms) - stats.count - stats.ongoing
+        if stats.count:
+            dataset.average = stats.rounded_average(lambda: self.complete_column(dataset))
+            dataset.range = f"{round(stats.minimum, 1)} - {round(stats.maximum, 1)}"
+        else:
+            dataset.average = '-'
+            dataset.range = '-'
+
+    def refresh_algorithm(self, algorithm):
+        stats = self.algorithm_statistics[algorithm]
+        algorithm.nfail = stats.nfail
+        algorithm.average = stats.rounded_average(lambda: self.complete_row(algorithm)) if stats.count else 0
 
+    def add_result(self, algorithm, dataset, result_value):
+        if (algorithm, dataset) in self.results:
+            raise DuplicateEntryError(f"Duplicate result for {algorithm.name} on {dataset.dataset_id}")
+        self.update_result(algorithm, dataset, result_value)
+
+    def update_result(self, algorithm, dataset, result_value):
+        self.track_statistics()
+        self.matrix = None
+        old_value = self.results.get((algorithm, dataset))
+        self.results[(algorithm, dataset)] = result_value
+        cache = self.statistics_cache
+        cache.mark('datasets', (dataset,))
+        cache.mark('algorithms', (algorithm,))
+        cache.mark('scores', (algorithm,))
+        if cache.stored_incomplete is not None:
+            incomplete = (ResultMatrix.MISSING, ResultMatrix.ONGOING)
+            if old_value is not None and ResultMatrix.classify(old_value)[0] in incomplete:
+                cache.stored_incomplete -= 1
+            if ResultMatrix.classify(result_value)[0] in incomplete:
+                cache.stored_incomplete += 1
+        if old_value is not None:
+            # Removal runs after the store so that rebuilt extremes no longer see the old value
+            self.accumulate_result(algorithm, dataset, ResultMatrix.classify(old_value), -1)
+        self.accumulate_result(algorithm, dataset, ResultMatrix.classify(result_value), 1)
+        self.refresh_dataset(dataset)
+        self.refresh_algorithm(algorithm)
+        if self.dataset_sketches is not None:
+            self.update_sketches(algorithm, dataset, old_value, result_value)
+
+    def get_sketches(self):
+        # Built in one pass over the stored results and then kept current by update_result
+        if self.dataset_sketches is None:
+            self.dataset_sketches = {dataset: QuantileSketch() for dataset in self.datasets}
+            self.algorithm_sketches = {algorithm: QuantileSketch() for algorithm in self.algorithms}
+            for (algorithm, dataset), result_value in self.results.items():
+                status, value = ResultMatrix.classify(result_value)
+                if status == ResultMatrix.OK:
+                    self.dataset_sketches[dataset].add(value)
+                    self.algorithm_sketches[algorithm].add(value)
+        return self.dataset_sketches, self.algorithm_sketches
+
+    def update_sketches(self, algorithm, dataset, old_value, result_value):
+        if old_value is not None and ResultMatrix.classify(old_value)[0] == ResultMatrix.OK:
+            # Sketches cannot forget a value, so the row and column are sketched again
+            self.dataset_sketches[dataset] = sketch = QuantileSketch()
+            for value in self.complete_column(dataset):
+                sketch.add(value)
+            self.algorithm_sketches[algorithm] = sketch = QuantileSketch()
+            for value in self.complete_row(algorithm):
+                sketch.add(value)
+            return
+        status, value = ResultMatrix.classify(result_value)
+        if status == ResultMatrix.OK:
+            self.dataset_sketches[dataset].add(value)
+            self.algorithm_sketches[algorithm].add(value)
+
+    def merge_sketches(self, other):
+        # Folds in the sketches of another Records loaded from a disjoint shard, matching entities by ID and name
+        dataset_sketches, algorithm_sketches = self.get_sketches()
+        other_dataset_sketches, other_algorithm_sketches = other.get_sketches()
+        for dataset, sketch in other_dataset_sketches.items():
+            if dataset.dataset_id in self.dataset_index:
+                dataset_sketches[self.dataset_index[dataset.dataset_id]].merge(sketch)
+        for algorithm, sketch in other_algorithm_sketches.items():
+            if algorithm.name in self.algorithm_index:
+                algorithm_sketches[self.algorithm_index[algorithm.name]].merge(sketch)
+
+    @staticmethod
+    def quantile_cells(sketch):
+        return tuple('-' if value is None else round(value, 1) for value in sketch.quantiles(QUANTILES))
+
+    def get_matrix(self):
+        if not isinstance(self.matrix, ResultMatrix):
+            np = optional_numpy()
+            if np is None:
+                self.matrix = ResultMatrix(self.algorithms, self.datasets, self.results)
+            else:
+                self.matrix = NumpyResultMatrix(self.algorithms, self.datasets, self.results, np)
+        return self.matrix
+
+    def get_shared_grid(self):
+        # The parallel passes keep their grid in the matrix slot, so every change that drops the matrix drops it too
+        if not isinstance(self.matrix, SharedResultGrid):
+            self.matrix = SharedResultGrid(self.algorithms, self.datasets)
+        return self.matrix
+
+    def matrix_pass(self):
+        # Columns from a snapshot or a parallel read fill the matrix without a per-cell lookup, so full passes use it
+        return self.columnar or (isinstance(self.results, SnapshotResults) and self.results.packed is None)
+
+    @instrumented('read_datasets', count_datasets)
     def read_datasets(self, dataset_file_name):
         try:
             with open(dataset_file_name, 'r') as file:
                 for line in file:
-                    data = line.strip().split(', ')
-                    dataset_id, name, weight, size, source = data
-                    if not (dataset_id.startswith('D') and dataset_id[-1] in ('S', 'A') and len(dataset_id[1:-1]) == 2 and dataset_id[1:-1].isdigit()):
-                        raise InvalidDatasetIDError(f"Invalid dataset ID: {dataset_id}")
-                    dataset = Dataset(dataset_id, name, int(weight), int(size), source)
-                    self.add_dataset(dataset)
+                    self.add_dataset(parse_dataset_line(line))
         except FileNotFoundError:
             print(f"File not found: {dataset_file_name}")
             exit()
+        except DuplicateEntryError as e:
+            print(e)
+            exit()
 
+    @instrumented('read_algorithms', count_algorithms)
     def read_algorithms(self, algorithm_file_name):
         try:
             with open(algorithm_file_name, 'r') as file:
                 for line in file:
-                    data = line.strip().split(', ')
-                    name, category, year, *authors = data
-                    algorithm = Algorithm(name, category, int(year), authors)
-                    self.add_algorithm(algorithm)
+                    self.add_algorithm(parse_algorithm_line(line))
         except FileNotFoundError:
             print(f"File not found: {algorithm_file_name}")
             exit()
+        except DuplicateEntryError as e:
+            print(e)
+            exit()
+
+    def validate_inputs(self, result_file_name, dataset_file_name, algorithm_file_name, fail_fast=False):
+        report = ValidationReport()
+        for file_name, kind in ((dataset_file_name, 'datasets'), (algorithm_file_name, 'algorithms'), (result_file_name, 'results')):
+            validate_file(file_name, kind, report, fail_fast)
+            if fail_fast and not report.ok:
+                break
+        return report
+
+    async def load_async(self, result_file_name, dataset_file_name, algorithm_file_name):
+        # Reads and tokenizes the three files concurrently in worker threads, then resolves the results against
+        # the entity indexes. Every problem is collected and raised together as one LoadError at the end.
+        import asyncio
+        self.clear_caches()
+        outcomes = await asyncio.gather(
+            asyncio.to_thread(parse_file_lines, dataset_file_name, parse_dataset_line),
+            asyncio.to_thread(parse_file_lines, algorithm_file_name, parse_algorithm_line),
+            asyncio.to_thread(parse_file_lines, result_file_name, tokenize_result_line),
+            return_exceptions=True,
+        )
+        errors = []
+        parsed = []
+        for file_name, outcome in zip((dataset_file_name, algorithm_file_name, result_file_name), outcomes):
+            if isinstance(outcome, OSError):
+                errors.append(f"File not found: {file_name}" if isinstance(outcome, FileNotFoundError) else f"{file_name}: {outcome}")
+                parsed.append([])
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                parsed.append(outcome[0])
+                errors.extend(outcome[1])
+        datasets, algorithms, result_lines = parsed
+        for dataset in datasets:
+            try:
+                self.add_dataset(dataset)
+            except DuplicateEntryError as e:
+                errors.append(f"{dataset_file_name}: {e}")
+        for algorithm in algorithms:
+            try:
+                self.add_algorithm(algorithm)
+            except DuplicateEntryError as e:
+                errors.append(f"{algorithm_file_name}: {e}")
+        for algorithm_name, cells in result_lines:
+            algorithm = self.algorithm_index.get(algorithm_name)
+            if algorithm is None:
+                continue
+            for dataset_id, result_value in cells:
+                dataset = self.dataset_index.get(dataset_id)
+                if dataset is not None:
+                    self.results[(algorithm, dataset)] = result_value
+        if errors:
+            raise LoadError(errors)
+
+    def iter_result_entries(self, file):
+        return parse_result_lines(file, self.algorithm_index, self.dataset_index)
+
+    def stream_results(self, result_file_name, batch_size=1000):
+        # Yields lists of (algorithm, dataset, status, value) without storing anything in self.results
+        batch = []
+        with open(result_file_name, 'r') as file:
+            for algorithm, dataset, result_value in self.iter_result_entries(file):
+                status, value = ResultMatrix.classify(result_value)
+                batch.append((algorithm, dataset, status, value))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
 
+    @instrumented('read_results', count_results)
     def read_results(self, result_file_name):
+        self.clear_caches()
         try:
             with open(result_file_name, 'r') as file:
-                for line in file:
-                    data = line.strip().split(', ')
-                    algorithm_name = data[0]
-                    results = data[1:]
-                    if not results:
-                        raise FileFormatError("Result file is empty.")
-                    for i, result in enumerate(results):
-                        dataset_id, result_value = result.split(': ')
-                        if dataset_id == '404':
-                            result_value = '--'
-                        elif not result_value.replace('.', '', 1).isdigit():
-                            raise InvalidResultError(f"Invalid result value: {result_value}")
-                        dataset = next((ds for ds in self.datasets if ds.dataset_id == dataset_id), None)
-                        algorithm = next((alg for alg in self.algorithms if alg.name == algorithm_name), None)
-                        if dataset and algorithm:
-                            self.results[(algorithm, dataset)] = result_value
+                for algorithm, dataset, result_value in self.iter_result_entries(file):
+                    self.results[(algorithm, dataset)] = result_value
         except FileNotFoundError:
             print(f"File not found: {result_file_name}")
             exit()
@@ -119,94 +1774,1149 @@ class Records:
             print(e)
             exit()
 
-    def compute_statistics(self):
-        for dataset in self.datasets:
+    @instrumented('read_results_parallel', count_results)
+    def read_results_parallel(self, result_file_name, workers=None):
+        # Same result as read_results; chunks are merged in file order so later lines still win
+        from concurrent.futures import ProcessPoolExecutor
+        self.clear_caches()
+        workers = workers or os.cpu_count() or 1
+        try:
+            ranges = split_file_ranges(result_file_name, workers * 4)
+        except FileNotFoundError:
+            print(f"File not found: {result_file_name}")
+            exit()
+        algorithm_names = [algorithm.name for algorithm in self.algorithms]
+        dataset_ids = [dataset.dataset_id for dataset in self.datasets]
+        rows, cols, value_ids = array('i'), array('i'), array('i')
+        value_table = {}
+        error = None
+        if workers == 1:
+            # A single worker would only add pickling, so the file is parsed here into the same columns
+            with open(result_file_name, 'r') as file:
+                chunks = [parse_result_columns(file, {name: i for i, name in enumerate(algorithm_names)},
+                                               {dataset_id: j for j, dataset_id in enumerate(dataset_ids)})]
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_chunk_worker, initargs=(algorithm_names, dataset_ids)) as executor:
+                futures = [executor.submit(_parse_result_chunk, result_file_name, start, end) for start, end in ranges]
+                chunks = [future.result() for future in futures]
+        for chunk_rows, chunk_cols, chunk_value_ids, chunk_values, error in chunks:
+            # Chunks are appended in file order; only each chunk's distinct values are renumbered one by one
+            renumber = [value_table.setdefault(result_value, len(value_table)) for result_value in chunk_values]
+            rows.extend(chunk_rows)
+            cols.extend(chunk_cols)
+            value_ids.extend(map(renumber.__getitem__, chunk_value_ids))
+            if error is not None:
+                break
+        values = list(value_table)
+        if self.results or self.sparse:
+            for row, col, value_id in zip(rows, cols, value_ids):
+                self.results[(self.algorithms[row], self.datasets[col])] = values[value_id]
+        elif len(set(map(int.__or__, map((1 << 32).__mul__, rows), cols))) == len(rows):
+            self.results = SnapshotResults(self.algorithms, self.datasets, rows, cols, value_ids, values)
+        else:
+            # Repeated cells keep their first position and their last value, as dict assignment does
+            self.results = PackedResults.from_columns(self.algorithms, self.datasets, rows, cols, map(values.__getitem__, value_ids))
+        if error is not None:
+            print(error)
+            exit()
+
+    @instrumented('read_result_shards', count_results)
+    def read_result_shards(self, result_file_names, merge='last', workers=None):
+        # result_file_names is a glob pattern or a list of paths; shards are merged in sorted/list order
+        from concurrent.futures import ProcessPoolExecutor
+        if merge not in MERGE_POLICIES:
+            raise ValueError(f"Unknown merge policy: {merge}")
+        if isinstance(result_file_names, str):
+            result_file_names = sorted(glob.glob(result_file_names))
+        self.clear_caches()
+        workers = workers or os.cpu_count() or 1
+        # Split shards into byte ranges too, so a handful of large shards still keeps every worker busy
+        chunks_per_shard = max(1, 2 * workers // max(1, len(result_file_names)))
+        shard_statistics = []
+        algorithm_names = [algorithm.name for algorithm in self.algorithms]
+        dataset_ids = [dataset.dataset_id for dataset in self.datasets]
+        with ProcessPoolExecutor(workers, initializer=_init_chunk_worker, initargs=(algorithm_names, dataset_ids)) as executor:
+            shard_futures = []
+            for result_file_name in result_file_names:
+                stats = {'file': result_file_name, 'results': 0, 'conflicts': 0, 'kept_existing': 0, 'failures': 0, 'error': None}
+                shard_statistics.append(stats)
+                try:
+                    ranges = split_file_ranges(result_file_name, chunks_per_shard)
+                except OSError as e:
+                    stats['error'] = str(e)
+                    ranges = []
+                shard_futures.append([executor.submit(_parse_result_chunk, result_file_name, start, end) for start, end in ranges])
+            for stats, futures in zip(shard_statistics, shard_futures):
+                for future in futures:
+                    rows, cols, value_ids, value_table, error = future.result()
+                    for row, col, result_value in zip(rows, cols, map(value_table.__getitem__, value_ids)):
+                        key = (self.algorithms[row], self.datasets[col])
+                        old_value = self.results.get(key)
+                        if old_value is not None:
+                            stats['conflicts'] += 1
+                            if merge_result(merge, old_value, result_value):
+                                stats['kept_existing'] += 1
+                                continue
+                        self.results[key] = result_value
+                        # Only stored 404s count, not ones the merge policy discards
+                        if result_value == '404':
+                            stats['failures'] += 1
+                    stats['results'] += len(rows)
+                    if error is not None:
+                        # Entries before the bad line are kept, as with read_results; the rest of the chunk is skipped
+                        stats['error'] = str(error)
+                        break
+        return shard_statistics
+
+    @instrumented('save_snapshot', count_results)
+    def save_snapshot(self, snapshot_file_name, input_file_names):
+        algorithm_rows = {algorithm: i for i, algorithm in enumerate(self.algorithms)}
+        dataset_cols = {dataset: j for j, dataset in enumerate(self.datasets)}
+        value_ids = {}
+        rows, cols, values = array('i'), array('i'), array('i')
+        for (algorithm, dataset), result_value in self.results.items():
+            rows.append(algorithm_rows[algorithm])
+            cols.append(dataset_cols[dataset])
+            values.append(value_ids.setdefault(result_value, len(value_ids)))
+        entities = json.dumps({
+            'datasets': [[ds.dataset_id, ds.name, ds.weight, ds.size, ds.source] for ds in self.datasets],
+            'algorithms': [[alg.name, alg.category, alg.year, alg.authors] for alg in self.algorithms],
+            'values': list(value_ids),
+        }).encode()
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, input_fingerprint(input_file_names), len(entities), len(rows))
+        temp_file_name = f"{snapshot_file_name}.tmp"
+        with open(temp_file_name, 'wb') as file:
+            file.write(header)
+            file.write(entities)
+            rows.tofile(file)
+            cols.tofile(file)
+            values.tofile(file)
+        os.replace(temp_file_name, snapshot_file_name)
+
+    @instrumented('load_snapshot', count_results)
+    def load_snapshot(self, snapshot_file_name, input_file_names):
+        # Returns False, leaving the records untouched, when the snapshot is missing, corrupt or stale
+        import mmap
+        try:
+            with open(snapshot_file_name, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                magic, fingerprint, entities_size, count = SNAPSHOT_HEADER.unpack_from(buffer)
+                if magic != SNAPSHOT_MAGIC or fingerprint != input_fingerprint(input_file_names):
+                    return False
+                offset = SNAPSHOT_HEADER.size
+                if len(buffer) != offset + entities_size + 3 * count * array('i').itemsize:
+                    return False
+                entities = json.loads(buffer[offset:offset + entities_size])
+                offset += entities_size
+                columns = []
+                for _ in range(3):
+                    column = array('i')
+                    column.frombytes(buffer[offset:offset + count * column.itemsize])
+                    offset += count * column.itemsize
+                    columns.append(column)
+        except (OSError, ValueError, struct.error):
+            return False
+        for dataset_id, name, weight, size, source in entities['datasets']:
+            self.add_dataset(Dataset(dataset_id, name, weight, size, source))
+        for name, category, year, authors in entities['algorithms']:
+            self.add_algorithm(Algorithm(name, category, year, authors))
+        values = entities['values']
+        rows, cols, value_ids = columns
+        if self.sparse:
+            for row, col, value_id in zip(rows, cols, value_ids):
+                self.results[(self.algorithms[row], self.datasets[col])] = values[value_id]
+        else:
+            self.results = SnapshotResults(self.algorithms, self.datasets, rows, cols, value_ids, values)
+        self.clear_caches()
+        return True
+
+    def load(self, result_file_name, dataset_file_name, algorithm_file_name, snapshot_file_name=None):
+        input_file_names = (dataset_file_name, algorithm_file_name, result_file_name)
+        if snapshot_file_name and self.load_snapshot(snapshot_file_name, input_file_names):
+            return
+        self.read_datasets(dataset_file_name)
+        self.read_algorithms(algorithm_file_name)
+        self.read_results(result_file_name)
+        if snapshot_file_name:
+            self.save_snapshot(snapshot_file_name, input_file_names)
+
+    def count_stored_incomplete(self):
+        cache = self.statistics_cache
+        if cache.stored_incomplete is None:
+            cache.stored_incomplete = sum(1 for result in self.results.values() if result in ('XX', None, '', '--'))
+        return cache.stored_incomplete
+
+    def compute_dataset_statistics(self, dataset):
+        if self.sparse:
+            complete_results = [result for _, result in self.results.column_items(dataset, self.algorithm_attribute_index.positions)]
+            absent_results = len(self.algorithms) - len(complete_results)
+        else:
             complete_results = [self.results.get((algorithm, dataset)) for algorithm in self.algorithms]
-            num_missing_results = sum(1 for result in complete_results if result in ('XX', None, ''))
-            num_failures = sum(1 for result in complete_results if result == '404')
-            dataset.nfail = num_missing_results + num_failures
-            complete_results = [float(result) for result in complete_results if result and result != '404']
+            absent_results = 0
+        num_missing_results = absent_results + sum(1 for result in complete_results if result in ('XX', None, ''))
+        num_failures = sum(1 for result in complete_results if result == '404')
+        dataset.nfail = num_missing_results + num_failures
+        # Stored 'XX' and '--' are skipped as in compute_all_statistics and the columnar path
+        complete_results = [float(result) for result in complete_results if result not in ('XX', None, '', '--', '404')]
+        dataset.average = round(sum(complete_results) / len(complete_results), 1) if complete_results else '-'
+        dataset.range = f"{round(min(complete_results), 1)} - {round(max(complete_results), 1)}" if complete_results else '-'
+
+    def compute_algorithm_row(self, algorithm, statistics=True, weights=None):
+        # Statistics and/or score of one algorithm, matching what the full passes compute for it
+        if self.sparse:
+            cells = self.results.row_items(algorithm, self.dataset_attribute_index.positions)
+        else:
+            cells = ((dataset, self.results.get((algorithm, dataset))) for dataset in self.datasets)
+        complete_results = []
+        fail_datasets = []
+        for dataset, result in cells:
+            if result == '404':
+                fail_datasets.append(f"{dataset.dataset_id} ({result})")
+            elif result not in ('XX', None, '', '--'):
+                complete_results.append(float(result))
+        if statistics:
+            algorithm.fail_datasets = fail_datasets
+            algorithm.nfail = len(fail_datasets)
+            if complete_results:
+                algorithm.average = round(sum(complete_results) / len(complete_results), 1)
+        if weights is not None:
+            algorithm.score = top_rank_score(complete_results, weights)
+
+    def refresh_stale_algorithms(self, statistics, weights):
+        # Recomputes only the algorithms whose statistics (and/or scores) were touched since the last pass
+        cache = self.statistics_cache
+        stale_statistics = cache.stale['algorithms'] if statistics else set()
+        stale_scores = cache.stale['scores'] if weights is not None else set()
+        for algorithm in self.algorithms:
+            if algorithm in stale_statistics or algorithm in stale_scores:
+                self.compute_algorithm_row(algorithm, algorithm in stale_statistics, weights if algorithm in stale_scores else None)
+        if statistics:
+            ongoing_results = self.count_stored_incomplete()
+            for algorithm in self.algorithms:
+                algorithm.ongoing_results = ongoing_results
+
+    @instrumented('compute_statistics', count_datasets)
+    def compute_statistics(self):
+        cache = self.statistics_cache
+        if self.sparse:
+            cache.expand('datasets', self.datasets)
+        stale = cache.stale['datasets']
+        if stale is not None:
+            for dataset in stale:
+                self.compute_dataset_statistics(dataset)
+        elif self.workers and self.workers > 1:
+            self.compute_statistics_parallel(datasets=True, algorithms=False, weights=None)
+        elif self.matrix_pass():
+            self.get_matrix().compute_dataset_statistics()
+        else:
+            for dataset in self.datasets:
+                self.compute_dataset_statistics(dataset)
+        cache.clean('datasets')
+
+    @instrumented('algorithm_compute_statistics', count_algorithms)
+    def compute_algorithm_statistics(self):
+        cache = self.statistics_cache
+        if self.sparse:
+            cache.expand('algorithms', self.algorithms)
+        if cache.stale['algorithms'] is not None:
+            self.refresh_stale_algorithms(True, None)
+        elif self.workers and self.workers > 1:
+            self.compute_statistics_parallel(datasets=False, algorithms=True, weights=None)
+        elif self.matrix_pass():
+            matrix = self.get_matrix()
+            matrix.compute_algorithm_statistics()
+            cache.stored_incomplete = matrix.stored_incomplete
+        else:
+            for algorithm in self.algorithms:
+                algorithm.compute_statistics(self.results, self.datasets)
+            cache.stored_incomplete = None
+            self.count_stored_incomplete()
+        cache.clean('algorithms')
+
+    @instrumented('compute_all_statistics', count_results)
+    def compute_all_statistics(self, weights=SCORE_WEIGHTS):
+        # One pass over the grid fills the dataset statistics, the algorithm statistics and the scores.
+        # When only some entities changed since the last call, just those are recomputed.
+        cache = self.statistics_cache
+        if cache.score_weights != weights:
+            cache.mark('scores')
+        if self.sparse:
+            # Walking only the present cells of every row and column beats the dense pass
+            cache.expand('datasets', self.datasets)
+            cache.expand('algorithms', self.algorithms)
+            cache.expand('scores', self.algorithms)
+        if all(cache.stale[aspect] is not None for aspect in cache.ASPECTS):
+            for dataset in cache.stale['datasets']:
+                self.compute_dataset_statistics(dataset)
+            if cache.stale['algorithms'] or cache.stale['scores']:
+                self.refresh_stale_algorithms(True, weights)
+            self.mark_all_computed(weights)
+            return
+        if self.workers and self.workers > 1:
+            self.compute_statistics_parallel(weights=weights)
+            self.mark_all_computed(weights)
+            return
+        if self.matrix_pass():
+            matrix = self.get_matrix()
+            matrix.compute_dataset_statistics()
+            matrix.compute_algorithm_statistics()
+            matrix.compute_scores(weights)
+            cache.stored_incomplete = matrix.stored_incomplete
+            self.mark_all_computed(weights)
+            return
+        ongoing_results = cache.stored_incomplete = sum(1 for result in self.results.values() if result in ('XX', None, '', '--'))
+        dataset_results = [[] for _ in self.datasets]
+        dataset_nfail = [0] * len(self.datasets)
+        for algorithm in self.algorithms:
+            complete_results = []
+            fail_datasets = []
+            for j, dataset in enumerate(self.datasets):
+                result = self.results.get((algorithm, dataset))
+                if result in ('XX', None, '', '--'):
+                    if result != '--':
+                        dataset_nfail[j] += 1
+                elif result == '404':
+                    dataset_nfail[j] += 1
+                    fail_datasets.append(f"{dataset.dataset_id} ({result})")
+                else:
+                    value = float(result)
+                    complete_results.append(value)
+                    dataset_results[j].append(value)
+            algorithm.ongoing_results = ongoing_results
+            algorithm.fail_datasets = fail_datasets
+            algorithm.nfail = len(fail_datasets)
+            if complete_results:
+                algorithm.average = round(sum(complete_results) / len(complete_results), 1)
+            algorithm.score = top_rank_score(complete_results, weights)
+        for dataset, complete_results, nfail in zip(self.datasets, dataset_results, dataset_nfail):
+            dataset.nfail = nfail
             dataset.average = round(sum(complete_results) / len(complete_results), 1) if complete_results else '-'
             dataset.range = f"{round(min(complete_results), 1)} - {round(max(complete_results), 1)}" if complete_results else '-'
+        self.mark_all_computed(weights)
+
+    def compute_statistics_parallel(self, datasets=True, algorithms=True, weights=SCORE_WEIGHTS, workers=None):
+        # Dataset columns and algorithm rows are split into shards that a process pool computes from the
+        # SharedResultGrid, so workers read the grid without it being pickled. The grid is filled on the first call by
+        # shards of the entry columns (snapshot and parallel-read columns are used as they are) and later calls reuse
+        # it until the results change. Shard results are applied by index, which keeps the outcome identical to the
+        # serial columnar pass whatever order they finish in.
+        from concurrent.futures import ProcessPoolExecutor
+        workers = workers or self.workers or os.cpu_count() or 1
+        grid = self.get_shared_grid()
+        initargs = (grid.values_block.name, grid.status_block.name, len(self.algorithms), grid.ncols)
+        entries = None
+        try:
+            if not grid.filled:
+                entries = grid.entries_block(self.results)
+                initargs += (entries[0].name,) + entries[1:]
+            with ProcessPoolExecutor(workers, initializer=_init_statistics_worker, initargs=initargs) as executor:
+                if entries is not None:
+                    ranges = split_index_ranges(entries[1], workers * 4)
+                    grid.stored_incomplete = sum(executor.map(_fill_grid_shard, [start for start, _ in ranges], [end for _, end in ranges]))
+                    grid.filled = True
+                dataset_futures = []
+                algorithm_futures = []
+                if datasets:
+                    dataset_futures = [executor.submit(_dataset_statistics_shard, start, end) for start, end in split_index_ranges(len(self.datasets), workers * 4)]
+                if algorithms or weights is not None:
+                    algorithm_futures = [executor.submit(_algorithm_statistics_shard, start, end, weights) for start, end in split_index_ranges(len(self.algorithms), workers * 4)]
+                for future in dataset_futures:
+                    for j, nfail, average, value_range in future.result():
+                        dataset = self.datasets[j]
+                        dataset.nfail = nfail
+                        dataset.average = average
+                        dataset.range = value_range
+                for future in algorithm_futures:
+                    for i, fail_columns, average, score in future.result():
+                        algorithm = self.algorithms[i]
+                        if algorithms:
+                            algorithm.ongoing_results = grid.stored_incomplete
+                            algorithm.fail_datasets = [f"{self.datasets[j].dataset_id} (404)" for j in fail_columns]
+                            algorithm.nfail = len(fail_columns)
+                            if average is not None:
+                                algorithm.average = average
+                        if score is not None:
+                            algorithm.score = score
+        finally:
+            if entries is not None:
+                release_shared_blocks((entries[0],))
+        if algorithms:
+            self.statistics_cache.stored_incomplete = grid.stored_incomplete
+
+    def mark_all_computed(self, weights):
+        cache = self.statistics_cache
+        for aspect in cache.ASPECTS:
+            cache.clean(aspect)
+        cache.score_weights = weights
+
+    def filter_datasets(self, dataset_type=None, source=None, min_weight=None, max_weight=None):
+        if dataset_type is source is min_weight is max_weight is None:
+            return self.datasets
+        return self.dataset_attribute_index.select([('type', dataset_type), ('source', source)], [('weight', min_weight, max_weight)])
+
+    def filter_algorithms(self, category=None, author=None, min_year=None, max_year=None):
+        if category is author is min_year is max_year is None:
+            return self.algorithms
+        return self.algorithm_attribute_index.select([('category', category), ('author', author)], [('year', min_year, max_year)])
+
+    def query(self, dataset_type=None, source=None, min_weight=None, max_weight=None, category=None, author=None, min_year=None, max_year=None):
+        # e.g. query(dataset_type='S', category='DL', min_year=2019).average(); year and weight bounds are inclusive
+        return ResultView(self.results, self.filter_algorithms(category, author, min_year, max_year), self.filter_datasets(dataset_type, source, min_weight, max_weight))
+
+    def find_extreme_datasets(self, statistic, largest=False, dataset_type=None):
+        # Every dataset tied for the smallest (or largest) value of the statistic
+        return self.statistics_cache.view(('extreme_datasets', statistic, largest, dataset_type),
+                                          lambda: extreme_entities(self.filter_datasets(dataset_type), statistic, largest))
+
+    def find_extreme_algorithms(self, statistic, largest=True, category=None):
+        return self.statistics_cache.view(('extreme_algorithms', statistic, largest, category),
+                                          lambda: extreme_entities(self.filter_algorithms(category), statistic, largest))
+
+    def top_datasets(self, statistic, k, largest=True, dataset_type=None):
+        return self.statistics_cache.view(('top_datasets', statistic, k, largest, dataset_type),
+                                          lambda: top_entities(self.filter_datasets(dataset_type), statistic, k, largest))
+
+    def top_algorithms(self, statistic, k, largest=True, category=None):
+        return self.statistics_cache.view(('top_algorithms', statistic, k, largest, category),
+                                          lambda: top_entities(self.filter_algorithms(category), statistic, k, largest))
+
+    def query_statistics(self, **criteria):
+        return self.statistics_cache.view(('query', tuple(sorted(criteria.items()))), lambda: self.query(**criteria).statistics())
 
     def find_most_difficult_datasets(self):
-        simple_datasets = [dataset for dataset in self.datasets if dataset.type == 'S']
-        advanced_datasets = [dataset for dataset in self.datasets if dataset.type == 'A']
-        simple_datasets.sort(key=lambda x: x.average, reverse=True)
-        advanced_datasets.sort(key=lambda x: x.average, reverse=True)
-        return simple_datasets, advanced_datasets
+        return self.statistics_cache.view(('most_difficult_datasets',), self.sort_datasets_by_type('average'))
 
     def find_most_failed_datasets(self):
-        simple_datasets = [dataset for dataset in self.datasets if dataset.type == 'S']
-        advanced_datasets = [dataset for dataset in self.datasets if dataset.type == 'A']
-        simple_datasets.sort(key=lambda x: x.nfail, reverse=True)
-        advanced_datasets.sort(key=lambda x: x.nfail, reverse=True)
-        return simple_datasets, advanced_datasets
+        return self.statistics_cache.view(('most_failed_datasets',), self.sort_datasets_by_type('nfail'))
 
-    def compute_scores(self):
-        for algorithm in self.algorithms:
-            scores = [float(self.results.get((algorithm, dataset))) if self.results.get((algorithm, dataset)) not in ('XX', '404', None, '', '--') else 0 for dataset in self.datasets]
-            scores.sort(reverse=True)
-            algorithm.score = scores.count(scores[0]) * 3 + scores.count(scores[1]) * 2 + scores.count(scores[2])
+    def sort_datasets_by_type(self, statistic):
+        def build():
+            simple_datasets = self.filter_datasets('S')
+            advanced_datasets = self.filter_datasets('A')
+            simple_datasets.sort(key=lambda x: getattr(x, statistic), reverse=True)
+            advanced_datasets.sort(key=lambda x: getattr(x, statistic), reverse=True)
+            return simple_datasets, advanced_datasets
+        return build
+
+    @instrumented('compute_scores', count_algorithms)
+    def compute_scores(self, weights=SCORE_WEIGHTS):
+        cache = self.statistics_cache
+        if cache.score_weights != weights:
+            cache.mark('scores')
+        if self.sparse:
+            cache.expand('scores', self.algorithms)
+        if cache.stale['scores'] is not None:
+            self.refresh_stale_algorithms(False, weights)
+        elif self.workers and self.workers > 1:
+            self.compute_statistics_parallel(datasets=False, algorithms=False, weights=weights)
+        elif self.matrix_pass():
+            self.get_matrix().compute_scores(weights)
+        else:
+            for algorithm in self.algorithms:
+                self.compute_algorithm_row(algorithm, False, weights)
+        cache.clean('scores')
+        cache.score_weights = weights
 
-    def display_results(self):
+    @instrumented('display_results_table', count_results)
+    def write_results_table(self, writer):
+        dataset_ids = [dataset.dataset_id for dataset in self.datasets]
+        # Rows are generated one at a time so the wide table is never held in memory as a whole
+        rows = ([algorithm.name] + ['XX' if result is None or result == '' else '--' if result == '404' else result
+                                    for result in (self.results.get((algorithm, dataset)) for dataset in self.datasets)]
+                for algorithm in self.algorithms)
+        writer.write_table("RESULTS", f"| Algorithms {' '.join(dataset_ids)} |", ['Algorithm', *dataset_ids], rows, lambda row: f"| {' '.join(row)} |")
+        nonexistent_results = sum(1 for result in self.results.values() if result == 'XX' or result is None or result == '')
+        ongoing_results = sum(1 for result in self.results.values() if result == '--' or result == '404')
+        writer.write_text("\nRESULTS SUMMARY\n")
+        writer.write_text(f"There are {len(self.algorithms)} algorithms and {len(self.datasets)} datasets.\n")
+        writer.write_text(f"The number of nonexistent results is {nonexistent_results} and ongoing results is {ongoing_results}\n")
+
+    def write_dataset_information(self, writer):
+        most_difficult_datasets = self.find_extreme_datasets('average')
+        most_failed_datasets = self.find_extreme_datasets('nfail', largest=True)
+
+        header = "| DatasetID Name Type Weight Ndata Source Average Range Nfail |"
+        columns = DATASET_COLUMNS
+        rows = map(dataset_row, self.datasets)
+        if self.sketches:
+            dataset_sketches = self.get_sketches()[0]
+            header = f"{header[:-1]}{' '.join(QUANTILE_COLUMNS)} |"
+            columns = DATASET_COLUMNS + QUANTILE_COLUMNS
+            rows = (dataset_row(dataset) + self.quantile_cells(dataset_sketches[dataset]) for dataset in self.datasets)
+
+        writer.write_text("\n")
+        writer.write_table("DATASET INFORMATION", header, columns, rows, dataset_text_row)
+        writer.write_text("\nDATASET SUMMARY\n")
+        if len(most_difficult_datasets) == 1:
+            writer.write_text(f"The most difficult dataset is {most_difficult_datasets[0].name} with an average result of {most_difficult_datasets[0].average}.\n")
+        else:
+            writer.write_text("The most difficult dataset is:\n")
+            for dataset in most_difficult_datasets:
+                writer.write_text(f"- {dataset.name} with an average result of {dataset.average}.\n")
+        if len(most_failed_datasets) == 1:
+            writer.write_text(f"The dataset with the most failures is {most_failed_datasets[0].name} with the number of failures being {most_failed_datasets[0].nfail}.\n")
+        else:
+            writer.write_text("The dataset with the most failures is:\n")
+            for dataset in most_failed_datasets:
+                writer.write_text(f"- {dataset.name} with the number of failures being {dataset.nfail}.\n")
+
+    def write_algorithm_information(self, writer):
+        best_algorithms = self.find_extreme_algorithms('average')
+        least_failure_algorithms = self.find_extreme_algorithms('nfail', largest=False)
+        rows = ((alg.name, alg.category, alg.year, '-'.join(alg.authors), alg.average, alg.nfail, ', '.join(alg.fail_datasets), alg.ongoing_results, alg.score) for alg in self.algorithms)
+        header = "| Name Туре Year Authors Average Nfail FailDataset Nongoing Score |"
+        columns = ALGORITHM_INFORMATION_COLUMNS
+        text_row = lambda row: str(self.get_algorithm(row[0]))
+        if self.sketches:
+            algorithm_sketches = self.get_sketches()[1]
+            header = f"{header[:-1]}{' '.join(QUANTILE_COLUMNS)} |"
+            columns = ALGORITHM_INFORMATION_COLUMNS + QUANTILE_COLUMNS
+            rows = (row + self.quantile_cells(algorithm_sketches[self.get_algorithm(row[0])]) for row in rows)
+            text_row = lambda row: f"{str(self.get_algorithm(row[0]))[:-1]}{' '.join(map(str, row[-len(QUANTILES):]))} |"
+
+        writer.write_text("\n")
+        writer.write_table("ALGORITHM INFORMATION", header, columns, rows, text_row)
+        if not best_algorithms:
+            return
+        best_algorithm_names = ', '.join(alg.name for alg in best_algorithms)
+        least_failure_algorithm_names = ', '.join(alg.name for alg in least_failure_algorithms)
+        writer.write_text("\nALGORITHM SUMMARY\n")
+        writer.write_text(f"The best algorithm{'s' if len(best_algorithms) > 1 else ''} is {best_algorithm_names} with an average result of {best_algorithms[0].average}.\n")
+        writer.write_text(f"The algorithm{'s' if len(least_failure_algorithms) > 1 else ''} with the least failure{'s' if len(least_failure_algorithms) > 1 else ''} is {least_failure_algorithm_names} with the number of failures being {least_failure_algorithms[0].nfail}.\n")
+
+    @instrumented('display_dataset_information', count_datasets)
+    def display_dataset_information(self):
+        with ReportWriter() as writer:
+            self.write_dataset_information(writer)
+
+    @instrumented('display_algorithm_information', count_algorithms)
+    def display_algorithm_information(self):
+        with ReportWriter() as writer:
+            self.write_algorithm_information(writer)
+
+    def write_report(self, writer):
         simple_datasets, advanced_datasets = self.find_most_difficult_datasets()
-        ml_algorithms, dl_algorithms = self.find_most_failed_datasets()
-
-        with open("reports.txt", "a") as report_file:
-            report_file.write(f"Report generated on: {self.report_time}\n\n")
-            report_file.write("Simple Dataset Information\n")
-            report_file.write("| DatasetID Name Type Weight Ndata Source Average Range Nfail |\n")
-            for dataset in simple_datasets:
-                dataset_line = f"| {dataset.dataset_id} {dataset.name} {dataset.type} {dataset.weight} {dataset.size} {dataset.source} {dataset.average} {dataset.range} {dataset.nfail} |\n"
-                report_file.write(dataset_line)
-
-            report_file.write("\nAdvanced Dataset Information\n")
-            report_file.write("| DatasetID Name Type Weight Ndata Source Average Range Nfail |\n")
-            for dataset in advanced_datasets:
-                dataset_line = f"| {dataset.dataset_id} {dataset.name} {dataset.type} {dataset.weight} {dataset.size} {dataset.source} {dataset.average} {dataset.range} {dataset.nfail} |\n"
-                report_file.write(dataset_line)
-            
-            ml_algorithms = [algorithm for algorithm in self.algorithms if algorithm.category == 'ML']
-        dl_algorithms = [algorithm for algorithm in self.algorithms if algorithm.category == 'DL']
-
-        with open("reports.txt", "a") as report_file:
-            # ... (other code)
-
-            report_file.write("\nML Algorithm Information\n")
-            report_file.write("| Name         Category Year Authors  |\n")
-            for algorithm in ml_algorithms:
-                authors_str = '-'.join(algorithm.authors)
-                algorithm_line = f"| {algorithm.name:<12} {algorithm.category:<4} {algorithm.year:<4} {authors_str:<20} |\n"
-                report_file.write(algorithm_line)
-
-            report_file.write("\nDL Algorithm Information\n")
-            report_file.write("| Name         Category Year Authors|\n")
-            for algorithm in dl_algorithms:
-                authors_str = '-'.join(algorithm.authors)
-                algorithm_line = f"| {algorithm.name:<12} {algorithm.category:<4} {algorithm.year:<4} {authors_str:<20} |\n"
-                report_file.write(algorithm_line)
+        ml_algorithms = self.filter_algorithms('ML')
+        dl_algorithms = self.filter_algorithms('DL')
+
+        header = "| DatasetID Name Type Weight Ndata Source Average Range Nfail |"
+        writer.write_text(f"Report generated on: {self.report_time}\n\n")
+        writer.write_table("Simple Dataset Information", header, DATASET_COLUMNS, map(dataset_row, simple_datasets), dataset_text_row)
+        writer.write_text("\n")
+        writer.write_table("Advanced Dataset Information", header, DATASET_COLUMNS, map(dataset_row, advanced_datasets), dataset_text_row)
+        writer.write_text("\n")
+        writer.write_table("ML Algorithm Information", "| Name         Category Year Authors  |", ALGORITHM_COLUMNS, map(algorithm_row, ml_algorithms), algorithm_text_row)
+        writer.write_text("\n")
+        writer.write_table("DL Algorithm Information", "| Name         Category Year Authors|", ALGORITHM_COLUMNS, map(algorithm_row, dl_algorithms), algorithm_text_row)
+
+    @instrumented('display_results', count_datasets)
+    def display_results(self, report_file_name="reports.txt", report_format='text', mode='a'):
+        with ReportWriter(report_file_name, report_format, mode) as writer:
+            self.write_report(writer)
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value BLOB);
+CREATE TABLE IF NOT EXISTS datasets (position INTEGER PRIMARY KEY, dataset_id TEXT NOT NULL UNIQUE, name TEXT, type TEXT,
+                                     weight INTEGER, size INTEGER, source TEXT);
+CREATE INDEX IF NOT EXISTS datasets_type ON datasets (type);
+CREATE TABLE IF NOT EXISTS algorithms (position INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, category TEXT, year INTEGER, authors TEXT);
+CREATE INDEX IF NOT EXISTS algorithms_category ON algorithms (category);
+CREATE TABLE IF NOT EXISTS results (algorithm INTEGER NOT NULL, dataset INTEGER NOT NULL, value TEXT NOT NULL, status INTEGER NOT NULL,
+                                    number REAL, PRIMARY KEY (algorithm, dataset)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_dataset ON results (dataset, algorithm, status, number);
+CREATE TABLE IF NOT EXISTS dataset_statistics (position INTEGER PRIMARY KEY, average REAL, nfail INTEGER);
+CREATE TABLE IF NOT EXISTS algorithm_statistics (position INTEGER PRIMARY KEY, average REAL, nfail INTEGER, score INTEGER);
+"""
+
+# Statistics mirrored into the *_statistics tables, which the SQLiteRecords rankings query
+SQLITE_RANKED_STATISTICS = {'dataset': ('average', 'nfail'), 'algorithm': ('average', 'nfail', 'score')}
+
+class SQLiteResults:
+    # Dict-like view of the results table. The cells of one algorithm are cached, so the per-cell reads of a
+    # row-by-row pass such as write_results_table cost one query per algorithm.
+    def __init__(self, records):
+        self.records = records
+        self.connection = records.connection
+        self.cached_algorithm = None
+        self.cached_row = None
+
+    def row(self, algorithm):
+        if algorithm is not self.cached_algorithm:
+            position = self.records.algorithm_attribute_index.positions.get(algorithm)
+            self.cached_row = dict(self.connection.execute("SELECT dataset, value FROM results WHERE algorithm = ?", (position,)))
+            self.cached_algorithm = algorithm
+        return self.cached_row
 
+    def __setitem__(self, key, value):
+        algorithm, dataset = key
+        row = self.records.algorithm_attribute_index.positions[algorithm]
+        col = self.records.dataset_attribute_index.positions[dataset]
+        status, number = ResultMatrix.classify(value)
+        self.connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)", (row, col, value, status, number))
+        if algorithm is self.cached_algorithm:
+            self.cached_row[col] = value
 
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        algorithm, dataset = key
+        col = self.records.dataset_attribute_index.positions.get(dataset)
+        return self.row(algorithm).get(col, default)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __iter__(self):
+        return (key for key, _ in self.items())
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        return (value for value, in self.connection.execute("SELECT value FROM results"))
+
+    def items(self):
+        algorithms = self.records.algorithms
+        datasets = self.records.datasets
+        return (((algorithms[row], datasets[col]), value) for row, col, value in self.connection.execute("SELECT algorithm, dataset, value FROM results"))
+
+class SQLiteRecords(Records):
+    # Records whose results live in a SQLite database instead of memory. Datasets and algorithms are still kept as
+    # objects for the reports, while the statistics and scores are aggregated by SQLite over the results table.
+    # The database is reused by load() as long as the three input files are unchanged.
+    def __init__(self, database_file_name='records.db', max_cached_views=64, batch_size=10000, sketches=False):
+        import sqlite3
+        super().__init__(max_cached_views=max_cached_views, sketches=sketches)
+        self.connection = sqlite3.connect(database_file_name)
+        self.connection.executescript(SQLITE_SCHEMA)
+        self.batch_size = batch_size
+        self.results = SQLiteResults(self)
+        # Set while read_datasets/read_algorithms collect their rows for one executemany
+        self.batching_entities = False
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    def add_dataset(self, dataset):
+        super().add_dataset(dataset)
+        if not self.batching_entities:
+            self.insert_datasets([dataset])
+
+    def add_algorithm(self, algorithm):
+        super().add_algorithm(algorithm)
+        if not self.batching_entities:
+            self.insert_algorithms([algorithm])
+
+    def insert_datasets(self, datasets):
+        positions = self.dataset_attribute_index.positions
+        self.connection.executemany("INSERT INTO datasets VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                    [(positions[ds], ds.dataset_id, ds.name, ds.type, ds.weight, ds.size, ds.source) for ds in datasets])
+        self.store_dataset_statistics(datasets)
+
+    def insert_algorithms(self, algorithms):
+        positions = self.algorithm_attribute_index.positions
+        self.connection.executemany("INSERT INTO algorithms VALUES (?, ?, ?, ?, ?)",
+                                    [(positions[alg], alg.name, alg.category, alg.year, json.dumps(alg.authors)) for alg in algorithms])
+        self.store_algorithm_statistics(algorithms)
+
+    def read_datasets(self, dataset_file_name):
+        # The rows of the whole file go in with one executemany instead of an INSERT per dataset
+        start = len(self.datasets)
+        self.batching_entities = True
+        try:
+            super().read_datasets(dataset_file_name)
+        finally:
+            self.batching_entities = False
+            self.insert_datasets(self.datasets[start:])
+
+    def read_algorithms(self, algorithm_file_name):
+        start = len(self.algorithms)
+        self.batching_entities = True
+        try:
+            super().read_algorithms(algorithm_file_name)
+        finally:
+            self.batching_entities = False
+            self.insert_algorithms(self.algorithms[start:])
+
+    def store_dataset_statistics(self, datasets):
+        positions = self.dataset_attribute_index.positions
+        self.connection.executemany("INSERT OR REPLACE INTO dataset_statistics VALUES (?, ?, ?)",
+                                    [(positions[ds], None if isinstance(ds.average, str) else ds.average, ds.nfail) for ds in datasets])
+
+    def store_algorithm_statistics(self, algorithms):
+        positions = self.algorithm_attribute_index.positions
+        self.connection.executemany("INSERT OR REPLACE INTO algorithm_statistics VALUES (?, ?, ?, ?)",
+                                    [(positions[alg], alg.average, alg.nfail, alg.score) for alg in algorithms])
+
+    def complete_column(self, dataset):
+        # Served by the results_dataset index, so column scans of update_result cost one query per dataset
+        query = "SELECT number FROM results INDEXED BY results_dataset WHERE dataset = ? AND status = ? ORDER BY algorithm"
+        return [number for number, in self.connection.execute(query, (self.dataset_attribute_index.positions[dataset], ResultMatrix.OK))]
+
+    def complete_row(self, algorithm):
+        query = "SELECT number FROM results WHERE algorithm = ? AND status = ? ORDER BY dataset"
+        return [number for number, in self.connection.execute(query, (self.algorithm_attribute_index.positions[algorithm], ResultMatrix.OK))]
+
+    def refresh_dataset(self, dataset):
+        super().refresh_dataset(dataset)
+        self.store_dataset_statistics([dataset])
+
+    def refresh_algorithm(self, algorithm):
+        super().refresh_algorithm(algorithm)
+        self.store_algorithm_statistics([algorithm])
+
+    def clear_caches(self):
+        super().clear_caches()
+        self.results.cached_algorithm = None
+
+    @instrumented('read_results', count_results)
+    def read_results(self, result_file_name):
+        self.clear_caches()
+        rows = self.algorithm_attribute_index.positions
+        cols = self.dataset_attribute_index.positions
+        batch = []
+        error = None
+        insert = "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)"
+        try:
+            with open(result_file_name, 'r') as file, self.connection:
+                try:
+                    for algorithm, dataset, result_value in self.iter_result_entries(file):
+                        batch.append((rows[algorithm], cols[dataset], result_value, *ResultMatrix.classify(result_value)))
+                        if len(batch) >= self.batch_size:
+                            self.connection.executemany(insert, batch)
+                            batch = []
+                except (FileFormatError, InvalidResultError) as e:
+                    # Entries before the bad line are kept, as with Records.read_results
+                    error = e
+                self.connection.executemany(insert, batch)
+        except FileNotFoundError:
+            print(f"File not found: {result_file_name}")
+            exit()
+        if error is not None:
+            print(error)
+            exit()
+
+    def stored_fingerprint(self):
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        return row[0] if row else None
+
+    def load_entities(self):
+        # Bypasses the INSERTs of add_dataset/add_algorithm since the rows are already in the database
+        for dataset_id, name, weight, size, source in self.connection.execute("SELECT dataset_id, name, weight, size, source FROM datasets ORDER BY position"):
+            Records.add_dataset(self, Dataset(dataset_id, name, weight, size, source))
+        for name, category, year, authors in self.connection.execute("SELECT name, category, year, authors FROM algorithms ORDER BY position"):
+            Records.add_algorithm(self, Algorithm(name, category, year, json.loads(authors)))
+        # Statistics of an earlier session are not reused; the tables restart from the fresh entities
+        self.store_dataset_statistics(self.datasets)
+        self.store_algorithm_statistics(self.algorithms)
+        self.clear_caches()
+
+    def load(self, result_file_name, dataset_file_name, algorithm_file_name, snapshot_file_name=None):
+        # The database plays the role of the snapshot, so snapshot_file_name is not used
+        try:
+            fingerprint = input_fingerprint((dataset_file_name, algorithm_file_name, result_file_name))
+        except OSError:
+            fingerprint = None
+        if fingerprint is not None and fingerprint == self.stored_fingerprint():
+            self.load_entities()
+            return
+        with self.connection:
+            for table in ('meta', 'results', 'algorithm_statistics', 'dataset_statistics', 'algorithms', 'datasets'):
+                self.connection.execute(f"DELETE FROM {table}")
+        self.read_datasets(dataset_file_name)
+        self.read_algorithms(algorithm_file_name)
+        self.read_results(result_file_name)
+        with self.connection:
+            self.connection.execute("INSERT INTO meta VALUES ('fingerprint', ?)", (fingerprint,))
+
+    def aggregate_dataset_statistics(self):
+        datasets = self.datasets
+        for dataset in datasets:
+            dataset.nfail = len(self.algorithms)
+            dataset.average = '-'
+            dataset.range = '-'
+        query = ("SELECT dataset, COUNT(*), SUM(status = ?), SUM(status = ?), COUNT(number), SUM(number), MIN(number), MAX(number) "
+                 "FROM results INDEXED BY results_dataset GROUP BY dataset")
+        for col, stored, missing, failed, count, total, minimum, maximum in self.connection.execute(query, (ResultMatrix.MISSING, ResultMatrix.FAILED)):
+            dataset = datasets[col]
+            # Cells without a row are missing as well
+            dataset.nfail = len(self.algorithms) - stored + missing + failed
+            if count:
+                dataset.average = round(total / count, 1)
+                dataset.range = f"{round(minimum, 1)} - {round(maximum, 1)}"
+        self.store_dataset_statistics(datasets)
+
+    def aggregate_algorithm_statistics(self):
+        algorithms = self.algorithms
+        ongoing_results = self.connection.execute("SELECT COUNT(*) FROM results WHERE status IN (?, ?)", (ResultMatrix.MISSING, ResultMatrix.ONGOING)).fetchone()[0]
+        self.statistics_cache.stored_incomplete = ongoing_results
+        for algorithm in algorithms:
+            algorithm.ongoing_results = ongoing_results
+            algorithm.fail_datasets = []
+        for row, count, total in self.connection.execute("SELECT algorithm, COUNT(number), SUM(number) FROM results GROUP BY algorithm"):
+            if count:
+                algorithms[row].average = round(total / count, 1)
+        query = ("SELECT results.algorithm, datasets.dataset_id FROM results JOIN datasets ON datasets.position = results.dataset "
+                 "WHERE results.status = ? ORDER BY results.algorithm, results.dataset")
+        for row, dataset_id in self.connection.execute(query, (ResultMatrix.FAILED,)):
+            algorithms[row].fail_datasets.append(f"{dataset_id} (404)")
+        for algorithm in algorithms:
+            algorithm.nfail = len(algorithm.fail_datasets)
+        self.store_algorithm_statistics(algorithms)
+
+    def aggregate_scores(self, weights):
+        # SQLite ranks the distinct complete values of every algorithm and counts the datasets reaching each,
+        # so only the top len(weights) of them come back to be weighted as in top_rank_score
+        algorithms = self.algorithms
+        for algorithm in algorithms:
+            algorithm.score = 0
+        query = ("SELECT algorithm, cells, score_rank FROM ("
+                 "SELECT algorithm, COUNT(*) AS cells, ROW_NUMBER() OVER (PARTITION BY algorithm ORDER BY number DESC) AS score_rank "
+                 "FROM results WHERE status = ? GROUP BY algorithm, number) "
+                 "WHERE score_rank <= ?")
+        for row, cells, score_rank in self.connection.execute(query, (ResultMatrix.OK, len(weights))):
+            algorithms[row].score += weights[score_rank - 1] * cells
+        self.store_algorithm_statistics(algorithms)
+
+    def ranked_positions(self, kind, statistic, filter_value, largest, k=None, nulls=False):
+        # Positions of the datasets or algorithms ranked by statistic in SQL: those tied for the extreme value when k is
+        # None, otherwise the k best in order with ties kept in entity order, as extreme_entities and top_entities do
+        table = f"{kind}_statistics AS s JOIN {kind}s AS e ON e.position = s.position"
+        where = f"(? IS NULL OR e.{'type' if kind == 'dataset' else 'category'} = ?)"
+        if not nulls:
+            where += f" AND s.{statistic} IS NOT NULL"
+        if k is None:
+            query = (f"SELECT s.position FROM {table} WHERE {where} AND s.{statistic} = "
+                     f"(SELECT {'MAX' if largest else 'MIN'}(s.{statistic}) FROM {table} WHERE {where}) ORDER BY s.position")
+            parameters = (filter_value,) * 4
+        else:
+            query = f"SELECT s.position FROM {table} WHERE {where} ORDER BY s.{statistic} {'DESC' if largest else 'ASC'}, s.position LIMIT ?"
+            parameters = (filter_value, filter_value, max(k, 0))
+        return [position for position, in self.connection.execute(query, parameters)]
+
+    def find_extreme_datasets(self, statistic, largest=False, dataset_type=None):
+        if statistic not in SQLITE_RANKED_STATISTICS['dataset']:
+            return super().find_extreme_datasets(statistic, largest, dataset_type)
+        return self.statistics_cache.view(('extreme_datasets', statistic, largest, dataset_type),
+                                          lambda: [self.datasets[j] for j in self.ranked_positions('dataset', statistic, dataset_type, largest)])
+
+    def find_extreme_algorithms(self, statistic, largest=True, category=None):
+        if statistic not in SQLITE_RANKED_STATISTICS['algorithm']:
+            return super().find_extreme_algorithms(statistic, largest, category)
+        return self.statistics_cache.view(('extreme_algorithms', statistic, largest, category),
+                                          lambda: [self.algorithms[i] for i in self.ranked_positions('algorithm', statistic, category, largest)])
+
+    def top_datasets(self, statistic, k, largest=True, dataset_type=None):
+        if statistic not in SQLITE_RANKED_STATISTICS['dataset']:
+            return super().top_datasets(statistic, k, largest, dataset_type)
+        return self.statistics_cache.view(('top_datasets', statistic, k, largest, dataset_type),
+                                          lambda: [self.datasets[j] for j in self.ranked_positions('dataset', statistic, dataset_type, largest, k)])
+
+    def top_algorithms(self, statistic, k, largest=True, category=None):
+        if statistic not in SQLITE_RANKED_STATISTICS['algorithm']:
+            return super().top_algorithms(statistic, k, largest, category)
+        return self.statistics_cache.view(('top_algorithms', statistic, k, largest, category),
+                                          lambda: [self.algorithms[i] for i in self.ranked_positions('algorithm', statistic, category, largest, k)])
+
+    def sort_datasets_by_type(self, statistic):
+        if statistic not in SQLITE_RANKED_STATISTICS['dataset']:
+            return super().sort_datasets_by_type(statistic)
+        def build():
+            # Datasets without a value sort last
+            return tuple([self.datasets[j] for j in self.ranked_positions('dataset', statistic, dataset_type, True, len(self.datasets), True)]
+                         for dataset_type in ('S', 'A'))
+        return build
+
+    @instrumented('compute_statistics', count_datasets)
+    def compute_statistics(self):
+        if self.statistics_cache.stale['datasets'] != set():
+            self.aggregate_dataset_statistics()
+            self.statistics_cache.clean('datasets')
+
+    @instrumented('algorithm_compute_statistics', count_algorithms)
+    def compute_algorithm_statistics(self):
+        if self.statistics_cache.stale['algorithms'] != set():
+            self.aggregate_algorithm_statistics()
+            self.statistics_cache.clean('algorithms')
+
+    @instrumented('compute_scores', count_algorithms)
+    def compute_scores(self, weights=SCORE_WEIGHTS):
+        cache = self.statistics_cache
+        if cache.stale['scores'] != set() or cache.score_weights != weights:
+            self.aggregate_scores(weights)
+            cache.clean('scores')
+            cache.score_weights = weights
+
+    @instrumented('compute_all_statistics', count_results)
+    def compute_all_statistics(self, weights=SCORE_WEIGHTS):
+        cache = self.statistics_cache
+        if cache.stale['datasets'] != set():
+            self.aggregate_dataset_statistics()
+        if cache.stale['algorithms'] != set():
+            self.aggregate_algorithm_statistics()
+        if cache.stale['scores'] != set() or cache.score_weights != weights:
+            self.aggregate_scores(weights)
+        self.mark_all_computed(weights)
+
+
+STATUS_NAMES = {ResultMatrix.OK: 'value', ResultMatrix.MISSING: 'XX', ResultMatrix.FAILED: '404', ResultMatrix.ONGOING: '--'}
+CELL_CHANGE_COLUMNS = ['Algorithm', 'DatasetID', 'Old', 'New', 'Change']
+DATASET_CHANGE_COLUMNS = ['DatasetID', 'OldAverage', 'NewAverage', 'OldNfail', 'NewNfail', 'OldRank', 'NewRank']
+ALGORITHM_CHANGE_COLUMNS = ['Name', 'OldAverage', 'NewAverage', 'OldNfail', 'NewNfail', 'OldScore', 'NewScore', 'OldRank', 'NewRank']
+
+def competition_ranks(entities, statistic, key):
+    # 1, 2, 2, 4 ranking by descending statistic; entities without a rankable value are left out
+    ranks = {}
+    rank = previous = None
+    for position, (entity, value) in enumerate(sorted(ranked_values(entities, statistic), key=lambda pair: pair[1], reverse=True), 1):
+        if value != previous:
+            rank = position
+            previous = value
+        ranks[key(entity)] = rank
+    return ranks
+
+def cell_change(old_value, new_value):
+    # None when the two stored results mean the same thing, otherwise a short description of the move
+    if old_value is None:
+        return 'added'
+    if new_value is None:
+        return 'removed'
+    old_status, old_number = ResultMatrix.classify(old_value)
+    new_status, new_number = ResultMatrix.classify(new_value)
+    if old_status != new_status:
+        return f"{STATUS_NAMES[old_status]} -> {STATUS_NAMES[new_status]}"
+    if old_number != new_number:
+        return 'changed'
+    return None
+
+class RecordsDiff:
+    def __init__(self):
+        self.cells = []
+        self.datasets_added = []
+        self.datasets_removed = []
+        self.algorithms_added = []
+        self.algorithms_removed = []
+        self.dataset_changes = []
+        self.algorithm_changes = []
+
+    def summary(self):
+        changes = {}
+        for *_, change in self.cells:
+            changes[change] = changes.get(change, 0) + 1
+        return {
+            'cells': changes,
+            'datasets_added': len(self.datasets_added),
+            'datasets_removed': len(self.datasets_removed),
+            'algorithms_added': len(self.algorithms_added),
+            'algorithms_removed': len(self.algorithms_removed),
+            'datasets_changed': len(self.dataset_changes),
+            'algorithms_changed': len(self.algorithm_changes),
+        }
+
+    def write(self, writer, max_cells=None):
+        # max_cells caps the listed cell changes; the summary still counts all of them
+        summary = self.summary()
+        writer.write_text("DELTA SUMMARY\n")
+        for label, entities in (("Datasets added", self.datasets_added), ("Datasets removed", self.datasets_removed),
+                                ("Algorithms added", self.algorithms_added), ("Algorithms removed", self.algorithms_removed)):
+            if entities:
+                writer.write_text(f"{label}: {', '.join(entities)}\n")
+        writer.write_text(f"{len(self.cells)} results differ"
+                          f"{': ' if summary['cells'] else ''}{', '.join(f'{count} {change}' for change, count in sorted(summary['cells'].items()))}\n")
+        writer.write_text("\n")
+        writer.write_table("RESULT CHANGES", f"| {' '.join(CELL_CHANGE_COLUMNS)} |", CELL_CHANGE_COLUMNS,
+                           self.cells[:max_cells], dataset_text_row)
+        writer.write_text("\n")
+        writer.write_table("DATASET CHANGES", f"| {' '.join(DATASET_CHANGE_COLUMNS)} |", DATASET_CHANGE_COLUMNS, self.dataset_changes, dataset_text_row)
+        writer.write_text("\n")
+        writer.write_table("ALGORITHM CHANGES", f"| {' '.join(ALGORITHM_CHANGE_COLUMNS)} |", ALGORITHM_CHANGE_COLUMNS, self.algorithm_changes, dataset_text_row)
+
+def compare_records(old_records, new_records, weights=SCORE_WEIGHTS):
+    # Hash joins on algorithm name and dataset ID, so the two Records need not share objects or ordering.
+    # Statistics and scores are (re)computed on both sides, which is free when they are already current.
+    diff = RecordsDiff()
+    old_records.compute_all_statistics(weights)
+    new_records.compute_all_statistics(weights)
+
+    old_cells = {(algorithm.name, dataset.dataset_id): value for (algorithm, dataset), value in old_records.results.items()}
+    for (algorithm, dataset), new_value in new_records.results.items():
+        key = (algorithm.name, dataset.dataset_id)
+        old_value = old_cells.pop(key, None)
+        change = cell_change(old_value, new_value)
+        if change is not None:
+            diff.cells.append((*key, 'XX' if old_value is None else old_value, new_value, change))
+    for key, old_value in old_cells.items():
+        diff.cells.append((*key, old_value, 'XX', 'removed'))
+    diff.cells.sort(key=lambda cell: (cell[0], cell[1]))
+
+    diff.datasets_added = [dataset_id for dataset_id in new_records.dataset_index if dataset_id not in old_records.dataset_index]
+    diff.datasets_removed = [dataset_id for dataset_id in old_records.dataset_index if dataset_id not in new_records.dataset_index]
+    diff.algorithms_added = [name for name in new_records.algorithm_index if name not in old_records.algorithm_index]
+    diff.algorithms_removed = [name for name in old_records.algorithm_index if name not in new_records.algorithm_index]
+
+    dataset_key = lambda dataset: dataset.dataset_id
+    old_ranks = competition_ranks(old_records.datasets, 'average', dataset_key)
+    new_ranks = competition_ranks(new_records.datasets, 'average', dataset_key)
+    for dataset in new_records.datasets:
+        old_dataset = old_records.get_dataset(dataset.dataset_id)
+        if old_dataset is None:
+            continue
+        row = (dataset.dataset_id, old_dataset.average, dataset.average, old_dataset.nfail, dataset.nfail,
+               old_ranks.get(dataset.dataset_id, '-'), new_ranks.get(dataset.dataset_id, '-'))
+        if row[1] != row[2] or row[3] != row[4] or row[5] != row[6]:
+            diff.dataset_changes.append(row)
+
+    algorithm_key = lambda algorithm: algorithm.name
+    old_ranks = competition_ranks(old_records.algorithms, 'score', algorithm_key)
+    new_ranks = competition_ranks(new_records.algorithms, 'score', algorithm_key)
+    for algorithm in new_records.algorithms:
+        old_algorithm = old_records.get_algorithm(algorithm.name)
+        if old_algorithm is None:
+            continue
+        row = (algorithm.name, old_algorithm.average, algorithm.average, old_algorithm.nfail, algorithm.nfail,
+               old_algorithm.score, algorithm.score, old_ranks.get(algorithm.name, '-'), new_ranks.get(algorithm.name, '-'))
+        if any(row[i] != row[i + 1] for i in range(1, len(row), 2)):
+            diff.algorithm_changes.append(row)
+    return diff
+
+def compare_inputs(old_file_names, new_file_names, weights=SCORE_WEIGHTS):
+    # Each argument is (result_file_name, dataset_file_name, algorithm_file_name), as taken by Records.load
+    old_records = Records()
+    old_records.load(*old_file_names)
+    new_records = Records()
+    new_records.load(*new_file_names)
+    return compare_records(old_records, new_records, weights)
+
+class ResultWatcher:
+    # Tails the result file and applies appended lines as deltas; any change to the dataset or algorithm file forces a reload
+    def __init__(self, result_file_name, dataset_file_name, algorithm_file_name, report_file_name="reports.txt", report_format='text', interval=1.0, debounce=2.0):
+        self.result_file_name = result_file_name
+        self.dataset_file_name = dataset_file_name
+        self.algorithm_file_name = algorithm_file_name
+        self.report_file_name = report_file_name
+        self.report_format = report_format
+        self.interval = interval
+        self.debounce = debounce
+        self.records = None
+        self.offset = 0
+        self.entity_stamps = None
+        self.dirty = False
+        self.last_change = 0.0
+
+    @staticmethod
+    def file_stamp(file_name):
+        stat = os.stat(file_name)
+        return stat.st_size, stat.st_mtime_ns
+
+    def reload(self):
+        self.entity_stamps = (self.file_stamp(self.dataset_file_name), self.file_stamp(self.algorithm_file_name))
+        self.records = Records()
+        self.records.read_datasets(self.dataset_file_name)
+        self.records.read_algorithms(self.algorithm_file_name)
+        self.offset = 0
+        self.read_appended(bulk=True)
+        self.records.track_statistics()
+        self.mark_dirty()
+
+    def read_appended(self, bulk=False):
+        # Only complete lines are consumed; a partially written last line is picked up on the next poll
+        with open(self.result_file_name, 'rb') as file:
+            file.seek(self.offset)
+            data = file.read()
+        end = data.rfind(b'\n') + 1
+        if not end:
+            return False
+        self.offset += end
+        records = self.records
+        for line in data[:end].decode().splitlines():
+            if not line.strip():
+                continue
+            try:
+                for algorithm, dataset, result_value in parse_result_lines([line], records.algorithm_index, records.dataset_index):
+                    if bulk:
+                        records.results[(algorithm, dataset)] = result_value
+                    else:
+                        records.update_result(algorithm, dataset, result_value)
+            except (FileFormatError, InvalidResultError, ValueError) as e:
+                print(f"Skipping result line: {e}")
+        return True
+
+    def mark_dirty(self):
+        self.dirty = True
+        self.last_change = time.monotonic()
+
+    def poll(self):
+        entity_stamps = (self.file_stamp(self.dataset_file_name), self.file_stamp(self.algorithm_file_name))
+        if self.records is None or entity_stamps != self.entity_stamps or os.path.getsize(self.result_file_name) < self.offset:
+            self.reload()
+        elif self.read_appended():
+            self.mark_dirty()
+        if self.dirty and time.monotonic() - self.last_change >= self.debounce:
+            self.render()
+
+    def render(self):
+        self.records.report_time = datetime.datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        # Memoized, so only the datasets touched since the last render are recomputed
+        self.records.compute_statistics()
+        # Each render replaces the report rather than appending another one, and readers never see a half-written file
+        temp_file_name = f"{self.report_file_name}.tmp"
+        self.records.display_results(temp_file_name, self.report_format, mode='w')
+        os.replace(temp_file_name, self.report_file_name)
+        self.dirty = False
+
+    def run(self):
+        while True:
+            try:
+                self.poll()
+            except FileNotFoundError as e:
+                print(f"File not found: {e.filename}")
+            time.sleep(self.interval)
 
 if __name__ == "__main__":
     import sys
 
-    if len(sys.argv) != 4:
-        print("Usage: python my_record.py <result_file_name> <dataset_file_name> <algorithm_file_name>")
+    args = []
+    options = {}
+    argv = iter(sys.argv[1:])
+    for arg in argv:
+        if arg in ('--watch', '--trace-memory'):
+            options[arg] = True
+        elif arg in ('--metrics', '--profile'):
+            options[arg] = next(argv, None)
+        else:
+            args.append(arg)
+    if len(args) not in (3, 4):
+        print("Usage: python my_record.py <result_file_name> <dataset_file_name> <algorithm_file_name> [snapshot_file_name] [--watch] [--metrics <json_file_name>] [--profile <stats_file_name>] [--trace-memory]")
+    elif options.get('--watch'):
+        ResultWatcher(args[0], args[1], args[2]).run()
     else:
-        result_file_name = sys.argv[1]
-        dataset_file_name = sys.argv[2]
-        algorithm_file_name = sys.argv[3]
+        result_file_name = args[0]
+        dataset_file_name = args[1]
+        algorithm_file_name = args[2]
+        snapshot_file_name = args[3] if len(args) == 4 else None
 
         records = Records()
-        records.read_datasets(dataset_file_name)
-        records.read_algorithms(algorithm_file_name)
-        records.read_results(result_file_name)
+        if '--metrics' in options or '--profile' in options or '--trace-memory' in options:
+            records.enable_metrics(profile='--profile' in options, trace_memory='--trace-memory' in options)
+        records.load(result_file_name, dataset_file_name, algorithm_file_name, snapshot_file_name)
 
         # Compute statistics, scores, and generate the report
-        records.compute_statistics()
-        records.compute_scores()
+        records.compute_all_statistics()
         records.display_results()
 
         print("Report generated successfully.")
+        if records.metrics is not None:
+            if options.get('--metrics'):
+                records.metrics.dump_json(options['--metrics'])
+            else:
+                print(json.dumps(records.metrics.to_dict(), indent=2))
+            if options.get('--profile'):
+                records.metrics.dump_profile(options['--profile'])
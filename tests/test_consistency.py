@@ -0,0 +1,114 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from part4 import Records, ReportWriter, SQLiteRecords
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+RESULT_FILE = os.path.join(FIXTURES, 'results.txt')
+DATASET_FILE = os.path.join(FIXTURES, 'datasets.txt')
+ALGORITHM_FILE = os.path.join(FIXTURES, 'algorithms.txt')
+
+
+def statistics(records):
+    return ([(dataset.dataset_id, dataset.average, dataset.range, dataset.nfail) for dataset in records.datasets],
+            [(algorithm.name, algorithm.average, algorithm.nfail, list(algorithm.fail_datasets), algorithm.ongoing_results, algorithm.score)
+             for algorithm in records.algorithms])
+
+
+def report(records, report_format='text'):
+    # Every report my_record.py writes, with the generation time pinned
+    records.report_time = '01/01/2024 00:00:00'
+    sink = io.StringIO()
+    with ReportWriter(sink, report_format) as writer:
+        records.write_results_table(writer)
+        records.write_dataset_information(writer)
+        records.write_algorithm_information(writer)
+        records.write_report(writer)
+    return sink.getvalue()
+
+
+class ConsistencyTest(unittest.TestCase):
+    # Every store and loading path must produce the report and statistics of a plain Records load
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.expected = self.computed(Records())
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def computed(self, records, load=None):
+        if load is None:
+            records.load(RESULT_FILE, DATASET_FILE, ALGORITHM_FILE)
+        else:
+            load(records)
+        records.compute_all_statistics()
+        return statistics(records), report(records)
+
+    def assertConsistent(self, records, load=None):
+        self.assertEqual(self.computed(records, load), self.expected)
+
+    def test_columnar(self):
+        self.assertConsistent(Records(columnar=True))
+
+    def test_sparse(self):
+        self.assertConsistent(Records(sparse=True))
+
+    def test_compact(self):
+        self.assertConsistent(Records(compact=True))
+
+    def test_workers(self):
+        self.assertConsistent(Records(workers=2))
+
+    def test_sqlite(self):
+        records = SQLiteRecords(os.path.join(self.directory, 'records.db'))
+        try:
+            self.assertConsistent(records)
+        finally:
+            records.close()
+
+    def test_snapshot_warm_start(self):
+        snapshot_file_name = os.path.join(self.directory, 'records.snap')
+        Records().load(RESULT_FILE, DATASET_FILE, ALGORITHM_FILE, snapshot_file_name)
+        records = Records()
+        self.assertTrue(records.load_snapshot(snapshot_file_name, (DATASET_FILE, ALGORITHM_FILE, RESULT_FILE)))
+        self.assertConsistent(records, lambda records: None)
+
+    def test_snapshot_warm_start_columnar(self):
+        snapshot_file_name = os.path.join(self.directory, 'records.snap')
+        Records().load(RESULT_FILE, DATASET_FILE, ALGORITHM_FILE, snapshot_file_name)
+        self.assertConsistent(Records(columnar=True), lambda records: records.load(RESULT_FILE, DATASET_FILE, ALGORITHM_FILE, snapshot_file_name))
+
+    def test_read_results_parallel(self):
+        def load(records):
+            records.read_datasets(DATASET_FILE)
+            records.read_algorithms(ALGORITHM_FILE)
+            records.read_results_parallel(RESULT_FILE, workers=2)
+        self.assertConsistent(Records(), load)
+        self.assertConsistent(Records(columnar=True), load)
+        self.assertConsistent(Records(workers=2), load)
+
+    def test_incremental_updates(self):
+        # Results changed one at a time through the running statistics match a full recomputation
+        records = Records()
+        records.load(RESULT_FILE, DATASET_FILE, ALGORITHM_FILE)
+        records.track_statistics()
+        knn, resnet = records.algorithms[0], records.algorithms[3]
+        records.update_result(knn, records.datasets[1], '404')
+        records.update_result(resnet, records.datasets[0], '88.8')
+        records.update_result(resnet, records.datasets[0], '97.1')
+        records.compute_all_statistics()
+        incremental = statistics(records)
+        records.clear_caches()
+        records.compute_all_statistics()
+        self.assertEqual(incremental, statistics(records))
+
+
+if __name__ == '__main__':
+    unittest.main()